@@ -4,50 +4,312 @@ Handles saving and loading test configurations to/from JSON files
 """
 
 import json
-import os
-from tkinter import filedialog, messagebox
-
-# Default directory for saving configurations
-CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configs')
+from dataclasses import dataclass, fields
+from pathlib import Path
+from tkinter import TclError, filedialog, messagebox
 
+try:
+    import orjson  # optional: native serializer
+except ImportError:
+    orjson = None
 
-def ensure_config_dir():
-    """Create the config directory if it doesn't exist"""
-    if not os.path.exists(CONFIG_DIR):
-        os.makedirs(CONFIG_DIR)
+# Default directory for saving configurations
+CONFIG_DIR = Path(__file__).resolve().parent / 'configs'
 
 
 def get_entry_value(entry_widget):
-    """Safely get value from an Entry widget"""
-    try:
-        return entry_widget.get()
-    except:
-        return ""
+    """Get value from an Entry widget ("" if the widget is missing)"""
+    return entry_widget.get() if entry_widget is not None else ""
 
 
 def get_var_value(var):
-    """Safely get value from a StringVar/IntVar"""
-    try:
-        return var.get()
-    except:
-        return ""
+    """Get value from a StringVar/IntVar ("" if the variable is missing)"""
+    return var.get() if var is not None else ""
 
 
 def set_entry_value(entry_widget, value):
-    """Safely set value in an Entry widget"""
-    try:
-        entry_widget.delete(0, 'end')
-        entry_widget.insert(0, str(value))
-    except:
-        pass
+    """Set value in an Entry widget (no-op if the widget is missing)"""
+    if entry_widget is None:
+        return
+    entry_widget.delete(0, 'end')
+    entry_widget.insert(0, str(value))
 
 
 def set_var_value(var, value):
-    """Safely set value in a StringVar/IntVar"""
+    """
+    Set value in a StringVar/IntVar (no-op if the variable is missing).
+    Returns True only if the value changed, so an unchanged value does not
+    fire the variable's traces or the caller's widget callbacks.
+    """
+    if var is None:
+        return False
     try:
-        var.set(value)
-    except:
-        pass
+        current = var.get()
+    except TclError:  # e.g. an IntVar currently holding non-numeric text
+        current = None
+    if current == value:
+        return False
+    var.set(value)
+    return True
+
+
+# Field tables: (json_key, gui attribute, widget kind). 'entry' fields are
+# Entry widgets, 'var' fields are StringVar/IntVar. A field is saved/loaded
+# only when the GUI instance has that attribute.
+ENTRY, VAR = 'entry', 'var'
+
+DIRECTORY_FIELDS = (
+    ('plot_dir', 'plot_dir_entry', ENTRY),
+    ('txt_dir', 'txt_dir_entry', ENTRY),
+)
+
+DEVICE_FIELDS = (
+    ('name', 'device_name_entry', ENTRY),
+    ('dimensions', 'device_dim_entry', ENTRY),
+    ('temperature', 'device_temp_entry', ENTRY),
+    ('test_laser', 'test_laser_button_var', VAR),
+)
+
+PULSE_FIELDS = (
+    ('step_size', 'step_size_entry', ENTRY),
+    ('delay', 'delay_entry', ENTRY),
+    ('pulse_width', 'pulse_width_entry', ENTRY),
+    ('frequency', 'frequency_entry', ENTRY),
+    ('series_resistance', 'series_resistance_entry', ENTRY),
+    ('start_voltage', 'start_voltage_entry', ENTRY),
+    ('stop_voltage', 'stop_voltage_entry', ENTRY),
+    ('start_current', 'start_current_entry', ENTRY),
+    ('stop_current', 'stop_current_entry', ENTRY),
+    ('current_limit', 'current_limit_entry', ENTRY),
+)
+
+SWEEP_FIELDS = (
+    ('step_size', 'step_size_entry', ENTRY),
+    ('num_of_pts', 'num_of_pts_entry', ENTRY),
+    ('compliance', 'compliance_entry', ENTRY),
+    ('sweep_type', 'radiobutton_var', VAR),
+    ('start_voltage', 'start_voltage_entry', ENTRY),
+    ('stop_voltage', 'stop_voltage_entry', ENTRY),
+    ('start_current', 'start_current_entry', ENTRY),
+    ('stop_current', 'stop_current_entry', ENTRY),
+)
+
+# Channel/impedance settings shared by the pulsed and CW instrument sections
+CHANNEL_FIELDS = (
+    ('light_channel', 'light_channel', VAR),
+    ('light_channel_impedance', 'light_channel_impedance', VAR),
+)
+
+PULSE_INSTRUMENT_FIELDS = (
+    ('pulse_address', 'pulse_address', VAR),
+    ('scope_address', 'scope_address', VAR),
+    ('current_channel', 'current_channel', VAR),
+    ('voltage_channel', 'voltage_channel', VAR),
+    ('trigger_channel', 'trigger_channel', VAR),
+    ('curr_channel_impedance', 'curr_channel_impedance', VAR),
+    ('volt_channel_impedance', 'volt_channel_impedance', VAR),
+    ('light_mode', 'lightMode_var', VAR),
+    ('thermopile_address', 'thermopile_address', VAR),
+) + CHANNEL_FIELDS
+
+CW_INSTRUMENT_FIELDS = (
+    ('keithley_address', 'keithley_address', VAR),
+    ('keithley1_address', 'keithley1_address', VAR),
+    ('keithley2_address', 'keithley2_address', VAR),
+    ('scope_address', 'scope_address', VAR),
+    ('osc_address', 'osc_address', VAR),
+    ('channel_impedance', 'channel_impedance', VAR),
+) + CHANNEL_FIELDS
+
+MEASUREMENT_FIELDS = (
+    ('wavelength', 'wavelength_entry', ENTRY),
+    ('medium_x', 'medium_x_entry', ENTRY),
+    ('medium_y', 'medium_y_entry', ENTRY),
+    ('distance', 'distance_entry', ENTRY),
+    ('detector_area', 'detector_area_entry', ENTRY),
+    ('transimpedance_gain', 'transimpedance_gain_entry', ENTRY),
+    ('responsivity', 'responsivity_entry', ENTRY),
+    ('compute_abs_power', 'computeAbsPower_var', VAR),
+)
+
+TEC_FIELDS = (
+    ('tec_address', 'tec_address', VAR),
+    ('tec_temp', 'tec_temp_entry', ENTRY),
+)
+
+# Sections written for each family of test types
+PULSE_SECTIONS = (
+    ('pulse', PULSE_FIELDS),
+    ('instruments', PULSE_INSTRUMENT_FIELDS),
+    ('measurement', MEASUREMENT_FIELDS),
+    ('tec', TEC_FIELDS),
+)
+
+CW_SECTIONS = (
+    ('sweep', SWEEP_FIELDS),
+    ('instruments', CW_INSTRUMENT_FIELDS),
+)
+
+# Every section a config file may contain, with all fields it may hold
+LOAD_SECTIONS = (
+    ('directories', DIRECTORY_FIELDS),
+    ('device', DEVICE_FIELDS),
+    ('pulse', PULSE_FIELDS),
+    ('sweep', SWEEP_FIELDS),
+    ('instruments', tuple(dict.fromkeys(PULSE_INSTRUMENT_FIELDS + CW_INSTRUMENT_FIELDS))),
+    ('measurement', MEASUREMENT_FIELDS),
+    ('tec', TEC_FIELDS),
+)
+
+# Layout callbacks to run after loading, by loaded value:
+# (section, json_key, {value: gui method name})
+SWEEP_CALLBACKS = {'Lin': 'lin_selected', 'Log': 'log_selected', 'Linlog': 'linlog_selected'}
+LIGHT_MODE_CALLBACKS = {'thermo': 'thermo_selected', 'osc': 'osc_selected'}
+
+LOAD_CALLBACKS = (
+    ('sweep', 'sweep_type', SWEEP_CALLBACKS),
+    ('instruments', 'light_mode', LIGHT_MODE_CALLBACKS),
+)
+
+
+# Config file schema: one record per section, written out independently of
+# the field tables so a table key missing here is caught (None = not on GUI)
+
+@dataclass(slots=True, frozen=True)
+class DirectoriesConfig:
+    plot_dir: str | None = None
+    txt_dir: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class DeviceConfig:
+    name: str | None = None
+    dimensions: str | None = None
+    temperature: str | None = None
+    test_laser: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class PulseConfig:
+    step_size: str | None = None
+    delay: str | None = None
+    pulse_width: str | None = None
+    frequency: str | None = None
+    series_resistance: str | None = None
+    start_voltage: str | None = None
+    stop_voltage: str | None = None
+    start_current: str | None = None
+    stop_current: str | None = None
+    current_limit: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class SweepConfig:
+    step_size: str | None = None
+    num_of_pts: str | None = None
+    compliance: str | None = None
+    sweep_type: str | None = None
+    start_voltage: str | None = None
+    stop_voltage: str | None = None
+    start_current: str | None = None
+    stop_current: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class InstrumentsConfig:
+    # Pulsed setups
+    pulse_address: str | None = None
+    current_channel: int | None = None
+    voltage_channel: int | None = None
+    trigger_channel: int | None = None
+    curr_channel_impedance: str | None = None
+    volt_channel_impedance: str | None = None
+    light_mode: str | None = None
+    thermopile_address: str | None = None
+    # CW setups
+    keithley_address: str | None = None
+    keithley1_address: str | None = None
+    keithley2_address: str | None = None
+    osc_address: str | None = None
+    channel_impedance: str | None = None
+    # Both
+    scope_address: str | None = None
+    light_channel: int | None = None
+    light_channel_impedance: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class MeasurementConfig:
+    wavelength: str | None = None
+    medium_x: str | None = None
+    medium_y: str | None = None
+    distance: str | None = None
+    detector_area: str | None = None
+    transimpedance_gain: str | None = None
+    responsivity: str | None = None
+    compute_abs_power: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class TecConfig:
+    tec_address: str | None = None
+    tec_temp: str | None = None
+
+
+SECTION_TYPES = {
+    'directories': DirectoriesConfig,
+    'device': DeviceConfig,
+    'pulse': PulseConfig,
+    'sweep': SweepConfig,
+    'instruments': InstrumentsConfig,
+    'measurement': MeasurementConfig,
+    'tec': TecConfig,
+}
+
+
+def _check_section_types():
+    """Fail at import if a field table has a key its section record lacks"""
+    for section, table in LOAD_SECTIONS:
+        names = {f.name for f in fields(SECTION_TYPES[section])}
+        unknown = [key for key, _, _ in table if key not in names]
+        if unknown:
+            raise TypeError(f"'{section}' config section has no field(s) {unknown}")
+
+
+_check_section_types()
+
+
+def record_to_dict(record):
+    """JSON-ready dict of a section record, leaving out fields not on the GUI"""
+    return {f.name: value for f in fields(record)
+            if (value := getattr(record, f.name)) is not None}
+
+
+def collect_fields(gui_instance, table):
+    """Read every field in a table that exists on the GUI into a dict"""
+    values = {}
+    for key, attr, kind in table:
+        widget = getattr(gui_instance, attr, None)
+        if widget is not None:
+            values[key] = (get_entry_value if kind == ENTRY else get_var_value)(widget)
+    return values
+
+
+def apply_fields(gui_instance, table, values):
+    """
+    Write the values present in a config section back to the GUI.
+    Returns the keys of the variables whose value actually changed.
+    """
+    changed = set()
+    for key, attr, kind in table:
+        if key not in values:
+            continue
+        widget = getattr(gui_instance, attr, None)
+        if kind == ENTRY:
+            set_entry_value(widget, values[key])
+        elif set_var_value(widget, values[key]):
+            changed.add(key)
+    return changed
 
 
 def save_config(gui_instance, test_type):
@@ -58,7 +320,7 @@ def save_config(gui_instance, test_type):
         gui_instance: The GUI class instance containing the entry widgets
         test_type: String identifier for the test type (e.g., 'VPulse_LI', 'CW_IV')
     """
-    ensure_config_dir()
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     
     # Build configuration dictionary based on test type
     config = {
@@ -66,151 +328,15 @@ def save_config(gui_instance, test_type):
         'version': '1.0'
     }
     
-    # Common settings for all tests
-    config['directories'] = {
-        'plot_dir': get_entry_value(gui_instance.plot_dir_entry),
-        'txt_dir': get_entry_value(gui_instance.txt_dir_entry)
-    }
-    
-    config['device'] = {
-        'name': get_entry_value(gui_instance.device_name_entry),
-        'dimensions': get_entry_value(gui_instance.device_dim_entry),
-        'temperature': get_entry_value(gui_instance.device_temp_entry),
-        'test_laser': get_var_value(gui_instance.test_laser_button_var)
-    }
-    
-    # Test-specific settings
+    # Common settings for all tests, then test-specific settings
+    sections = (('directories', DIRECTORY_FIELDS), ('device', DEVICE_FIELDS))
     if test_type.startswith('VPulse') or test_type.startswith('IPulse'):
-        # Pulsed measurement settings
-        config['pulse'] = {}
-        
-        if hasattr(gui_instance, 'step_size_entry'):
-            config['pulse']['step_size'] = get_entry_value(gui_instance.step_size_entry)
-        if hasattr(gui_instance, 'delay_entry'):
-            config['pulse']['delay'] = get_entry_value(gui_instance.delay_entry)
-        if hasattr(gui_instance, 'pulse_width_entry'):
-            config['pulse']['pulse_width'] = get_entry_value(gui_instance.pulse_width_entry)
-        if hasattr(gui_instance, 'frequency_entry'):
-            config['pulse']['frequency'] = get_entry_value(gui_instance.frequency_entry)
-        if hasattr(gui_instance, 'series_resistance_entry'):
-            config['pulse']['series_resistance'] = get_entry_value(gui_instance.series_resistance_entry)
-        
-        # Voltage-based pulsed tests
-        if hasattr(gui_instance, 'start_voltage_entry'):
-            config['pulse']['start_voltage'] = get_entry_value(gui_instance.start_voltage_entry)
-        if hasattr(gui_instance, 'stop_voltage_entry'):
-            config['pulse']['stop_voltage'] = get_entry_value(gui_instance.stop_voltage_entry)
-        
-        # Current-based pulsed tests
-        if hasattr(gui_instance, 'start_current_entry'):
-            config['pulse']['start_current'] = get_entry_value(gui_instance.start_current_entry)
-        if hasattr(gui_instance, 'stop_current_entry'):
-            config['pulse']['stop_current'] = get_entry_value(gui_instance.stop_current_entry)
-        if hasattr(gui_instance, 'current_limit_entry'):
-            config['pulse']['current_limit'] = get_entry_value(gui_instance.current_limit_entry)
-        
-        # Instrument settings - addresses
-        config['instruments'] = {}
-        if hasattr(gui_instance, 'pulse_address'):
-            config['instruments']['pulse_address'] = get_var_value(gui_instance.pulse_address)
-        if hasattr(gui_instance, 'scope_address'):
-            config['instruments']['scope_address'] = get_var_value(gui_instance.scope_address)
-        
-        # Channel settings
-        if hasattr(gui_instance, 'current_channel'):
-            config['instruments']['current_channel'] = get_var_value(gui_instance.current_channel)
-        if hasattr(gui_instance, 'voltage_channel'):
-            config['instruments']['voltage_channel'] = get_var_value(gui_instance.voltage_channel)
-        if hasattr(gui_instance, 'light_channel'):
-            config['instruments']['light_channel'] = get_var_value(gui_instance.light_channel)
-        if hasattr(gui_instance, 'trigger_channel'):
-            config['instruments']['trigger_channel'] = get_var_value(gui_instance.trigger_channel)
-        
-        # Impedance settings
-        if hasattr(gui_instance, 'curr_channel_impedance'):
-            config['instruments']['curr_channel_impedance'] = get_var_value(gui_instance.curr_channel_impedance)
-        if hasattr(gui_instance, 'volt_channel_impedance'):
-            config['instruments']['volt_channel_impedance'] = get_var_value(gui_instance.volt_channel_impedance)
-        if hasattr(gui_instance, 'light_channel_impedance'):
-            config['instruments']['light_channel_impedance'] = get_var_value(gui_instance.light_channel_impedance)
-    
-        # Light mode and thermopile
-        if hasattr(gui_instance, 'lightMode_var'):
-            config['instruments']['light_mode'] = get_var_value(gui_instance.lightMode_var)
-        if hasattr(gui_instance, 'thermopile_address'):
-            config['instruments']['thermopile_address'] = get_var_value(gui_instance.thermopile_address)
-
-        # Measurement parameters
-        config['measurement'] = {}
-        if hasattr(gui_instance, 'wavelength_entry'):
-            config['measurement']['wavelength'] = get_entry_value(gui_instance.wavelength_entry)
-        if hasattr(gui_instance, 'medium_x_entry'):
-            config['measurement']['medium_x'] = get_entry_value(gui_instance.medium_x_entry)
-        if hasattr(gui_instance, 'medium_y_entry'):
-            config['measurement']['medium_y'] = get_entry_value(gui_instance.medium_y_entry)
-        if hasattr(gui_instance, 'distance_entry'):
-            config['measurement']['distance'] = get_entry_value(gui_instance.distance_entry)
-        if hasattr(gui_instance, 'detector_area_entry'):
-            config['measurement']['detector_area'] = get_entry_value(gui_instance.detector_area_entry)
-        if hasattr(gui_instance, 'transimpedance_gain_entry'):
-            config['measurement']['transimpedance_gain'] = get_entry_value(gui_instance.transimpedance_gain_entry)
-        if hasattr(gui_instance, 'responsivity_entry'):
-            config['measurement']['responsivity'] = get_entry_value(gui_instance.responsivity_entry)
-        if hasattr(gui_instance, 'computeAbsPower_var'):
-            config['measurement']['compute_abs_power'] = get_var_value(gui_instance.computeAbsPower_var)
-
-        # TEC
-        config['tec'] = {}
-        if hasattr(gui_instance, 'tec_address'):
-            config['tec']['tec_address'] = get_var_value(gui_instance.tec_address)
-        if hasattr(gui_instance, 'tec_temp_entry'):
-            config['tec']['tec_temp'] = get_entry_value(gui_instance.tec_temp_entry)
-            
+        sections += PULSE_SECTIONS
     elif test_type.startswith('CW'):
-        # CW measurement settings
-        config['sweep'] = {}
-        
-        if hasattr(gui_instance, 'step_size_entry'):
-            config['sweep']['step_size'] = get_entry_value(gui_instance.step_size_entry)
-        if hasattr(gui_instance, 'num_of_pts_entry'):
-            config['sweep']['num_of_pts'] = get_entry_value(gui_instance.num_of_pts_entry)
-        if hasattr(gui_instance, 'compliance_entry'):
-            config['sweep']['compliance'] = get_entry_value(gui_instance.compliance_entry)
-        if hasattr(gui_instance, 'radiobutton_var'):
-            config['sweep']['sweep_type'] = get_var_value(gui_instance.radiobutton_var)
-        
-        # Voltage-based CW tests
-        if hasattr(gui_instance, 'start_voltage_entry'):
-            config['sweep']['start_voltage'] = get_entry_value(gui_instance.start_voltage_entry)
-        if hasattr(gui_instance, 'stop_voltage_entry'):
-            config['sweep']['stop_voltage'] = get_entry_value(gui_instance.stop_voltage_entry)
-        
-        # Current-based CW tests
-        if hasattr(gui_instance, 'start_current_entry'):
-            config['sweep']['start_current'] = get_entry_value(gui_instance.start_current_entry)
-        if hasattr(gui_instance, 'stop_current_entry'):
-            config['sweep']['stop_current'] = get_entry_value(gui_instance.stop_current_entry)
-        
-        # Instrument settings
-        config['instruments'] = {}
-        if hasattr(gui_instance, 'keithley_address'):
-            config['instruments']['keithley_address'] = get_var_value(gui_instance.keithley_address)
-        if hasattr(gui_instance, 'keithley1_address'):
-            config['instruments']['keithley1_address'] = get_var_value(gui_instance.keithley1_address)
-        if hasattr(gui_instance, 'keithley2_address'):
-            config['instruments']['keithley2_address'] = get_var_value(gui_instance.keithley2_address)
-        if hasattr(gui_instance, 'scope_address'):
-            config['instruments']['scope_address'] = get_var_value(gui_instance.scope_address)
-        if hasattr(gui_instance, 'osc_address'):
-            config['instruments']['osc_address'] = get_var_value(gui_instance.osc_address)
-        
-        # Channel settings
-        if hasattr(gui_instance, 'light_channel'):
-            config['instruments']['light_channel'] = get_var_value(gui_instance.light_channel)
-        if hasattr(gui_instance, 'channel_impedance'):
-            config['instruments']['channel_impedance'] = get_var_value(gui_instance.channel_impedance)
-        if hasattr(gui_instance, 'light_channel_impedance'):
-            config['instruments']['light_channel_impedance'] = get_var_value(gui_instance.light_channel_impedance)
+        sections += CW_SECTIONS
+    for section, table in sections:
+        record = SECTION_TYPES[section](**collect_fields(gui_instance, table))
+        config[section] = record_to_dict(record)
     
     # Ask user for save location
     default_filename = f"{test_type}_config.json"
@@ -224,8 +350,12 @@ def save_config(gui_instance, test_type):
     
     if filepath:
         try:
-            with open(filepath, 'w') as f:
-                json.dump(config, f, indent=4)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(config, f, indent=2)
             messagebox.showinfo('Success', f'Configuration saved to:\n{filepath}')
         except Exception as e:
             messagebox.showerror('Error', f'Failed to save configuration:\n{str(e)}')
@@ -239,7 +369,7 @@ def load_config(gui_instance, test_type):
         gui_instance: The GUI class instance containing the entry widgets
         test_type: String identifier for the expected test type
     """
-    ensure_config_dir()
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     
     # Ask user to select file
     filepath = filedialog.askopenfilename(
@@ -269,155 +399,23 @@ def load_config(gui_instance, test_type):
         if not result:
             return
     
-    # Load directories
-    if 'directories' in config:
-        dirs = config['directories']
-        if 'plot_dir' in dirs:
-            set_entry_value(gui_instance.plot_dir_entry, dirs['plot_dir'])
-        if 'txt_dir' in dirs:
-            set_entry_value(gui_instance.txt_dir_entry, dirs['txt_dir'])
-    
-    # Load device settings
-    if 'device' in config:
-        dev = config['device']
-        if 'name' in dev:
-            set_entry_value(gui_instance.device_name_entry, dev['name'])
-        if 'dimensions' in dev:
-            set_entry_value(gui_instance.device_dim_entry, dev['dimensions'])
-        if 'temperature' in dev:
-            set_entry_value(gui_instance.device_temp_entry, dev['temperature'])
-        if 'test_laser' in dev and hasattr(gui_instance, 'test_laser_button_var'):
-            set_var_value(gui_instance.test_laser_button_var, dev['test_laser'])
+    changed = {}
+    for section, table in LOAD_SECTIONS:
+        if section in config:
+            changed[section] = apply_fields(gui_instance, table, config[section])
     
-    # Load pulse settings (VPulse/IPulse)
-    if 'pulse' in config:
-        pulse = config['pulse']
-        if 'step_size' in pulse and hasattr(gui_instance, 'step_size_entry'):
-            set_entry_value(gui_instance.step_size_entry, pulse['step_size'])
-        if 'delay' in pulse and hasattr(gui_instance, 'delay_entry'):
-            set_entry_value(gui_instance.delay_entry, pulse['delay'])
-        if 'pulse_width' in pulse and hasattr(gui_instance, 'pulse_width_entry'):
-            set_entry_value(gui_instance.pulse_width_entry, pulse['pulse_width'])
-        if 'frequency' in pulse and hasattr(gui_instance, 'frequency_entry'):
-            set_entry_value(gui_instance.frequency_entry, pulse['frequency'])
-        if 'series_resistance' in pulse and hasattr(gui_instance, 'series_resistance_entry'):
-            set_entry_value(gui_instance.series_resistance_entry, pulse['series_resistance'])
-        if 'start_voltage' in pulse and hasattr(gui_instance, 'start_voltage_entry'):
-            set_entry_value(gui_instance.start_voltage_entry, pulse['start_voltage'])
-        if 'stop_voltage' in pulse and hasattr(gui_instance, 'stop_voltage_entry'):
-            set_entry_value(gui_instance.stop_voltage_entry, pulse['stop_voltage'])
-        if 'start_current' in pulse and hasattr(gui_instance, 'start_current_entry'):
-            set_entry_value(gui_instance.start_current_entry, pulse['start_current'])
-        if 'stop_current' in pulse and hasattr(gui_instance, 'stop_current_entry'):
-            set_entry_value(gui_instance.stop_current_entry, pulse['stop_current'])
-        if 'current_limit' in pulse and hasattr(gui_instance, 'current_limit_entry'):
-            set_entry_value(gui_instance.current_limit_entry, pulse['current_limit'])
-    
-    # Load sweep settings (CW)
-    if 'sweep' in config:
-        sweep = config['sweep']
-        if 'step_size' in sweep and hasattr(gui_instance, 'step_size_entry'):
-            set_entry_value(gui_instance.step_size_entry, sweep['step_size'])
-        if 'num_of_pts' in sweep and hasattr(gui_instance, 'num_of_pts_entry'):
-            set_entry_value(gui_instance.num_of_pts_entry, sweep['num_of_pts'])
-        if 'compliance' in sweep and hasattr(gui_instance, 'compliance_entry'):
-            set_entry_value(gui_instance.compliance_entry, sweep['compliance'])
-        if 'sweep_type' in sweep and hasattr(gui_instance, 'radiobutton_var'):
-            set_var_value(gui_instance.radiobutton_var, sweep['sweep_type'])
-            # Trigger the appropriate radio button callback
-            if sweep['sweep_type'] == 'Lin' and hasattr(gui_instance, 'lin_selected'):
-                gui_instance.lin_selected()
-            elif sweep['sweep_type'] == 'Log' and hasattr(gui_instance, 'log_selected'):
-                gui_instance.log_selected()
-            elif sweep['sweep_type'] == 'Linlog' and hasattr(gui_instance, 'linlog_selected'):
-                gui_instance.linlog_selected()
-        if 'start_voltage' in sweep and hasattr(gui_instance, 'start_voltage_entry'):
-            set_entry_value(gui_instance.start_voltage_entry, sweep['start_voltage'])
-        if 'stop_voltage' in sweep and hasattr(gui_instance, 'stop_voltage_entry'):
-            set_entry_value(gui_instance.stop_voltage_entry, sweep['stop_voltage'])
-        if 'start_current' in sweep and hasattr(gui_instance, 'start_current_entry'):
-            set_entry_value(gui_instance.start_current_entry, sweep['start_current'])
-        if 'stop_current' in sweep and hasattr(gui_instance, 'stop_current_entry'):
-            set_entry_value(gui_instance.stop_current_entry, sweep['stop_current'])
-    
-    # Load instrument settings
-    if 'instruments' in config:
-        instr = config['instruments']
-        # Addresses
-        if 'pulse_address' in instr and hasattr(gui_instance, 'pulse_address'):
-            set_var_value(gui_instance.pulse_address, instr['pulse_address'])
-        if 'scope_address' in instr and hasattr(gui_instance, 'scope_address'):
-            set_var_value(gui_instance.scope_address, instr['scope_address'])
-        if 'keithley_address' in instr and hasattr(gui_instance, 'keithley_address'):
-            set_var_value(gui_instance.keithley_address, instr['keithley_address'])
-        if 'keithley1_address' in instr and hasattr(gui_instance, 'keithley1_address'):
-            set_var_value(gui_instance.keithley1_address, instr['keithley1_address'])
-        if 'keithley2_address' in instr and hasattr(gui_instance, 'keithley2_address'):
-            set_var_value(gui_instance.keithley2_address, instr['keithley2_address'])
-        if 'osc_address' in instr and hasattr(gui_instance, 'osc_address'):
-            set_var_value(gui_instance.osc_address, instr['osc_address'])
-        
-        # Channels
-        if 'current_channel' in instr and hasattr(gui_instance, 'current_channel'):
-            set_var_value(gui_instance.current_channel, instr['current_channel'])
-        if 'voltage_channel' in instr and hasattr(gui_instance, 'voltage_channel'):
-            set_var_value(gui_instance.voltage_channel, instr['voltage_channel'])
-        if 'light_channel' in instr and hasattr(gui_instance, 'light_channel'):
-            set_var_value(gui_instance.light_channel, instr['light_channel'])
-        if 'trigger_channel' in instr and hasattr(gui_instance, 'trigger_channel'):
-            set_var_value(gui_instance.trigger_channel, instr['trigger_channel'])
-        
-        # Impedances
-        if 'curr_channel_impedance' in instr and hasattr(gui_instance, 'curr_channel_impedance'):
-            set_var_value(gui_instance.curr_channel_impedance, instr['curr_channel_impedance'])
-        if 'volt_channel_impedance' in instr and hasattr(gui_instance, 'volt_channel_impedance'):
-            set_var_value(gui_instance.volt_channel_impedance, instr['volt_channel_impedance'])
-        if 'light_channel_impedance' in instr and hasattr(gui_instance, 'light_channel_impedance'):
-            set_var_value(gui_instance.light_channel_impedance, instr['light_channel_impedance'])
-        if 'channel_impedance' in instr and hasattr(gui_instance, 'channel_impedance'):
-            set_var_value(gui_instance.channel_impedance, instr['channel_impedance'])
+    # Trigger the callbacks of widgets whose value changes the UI layout,
+    # only when the loaded value differs from what was already selected
+    for section, key, callbacks in LOAD_CALLBACKS:
+        if key in changed.get(section, ()):
+            callback = getattr(gui_instance, callbacks.get(config[section][key], ''), None)
+            if callback is not None:
+                callback()
     
-        # Light mode and thermopile
-        if 'light_mode' in instr and hasattr(gui_instance, 'lightMode_var'):
-            set_var_value(gui_instance.lightMode_var, instr['light_mode'])
-            # Trigger the callback so the UI updates correctly
-            if instr['light_mode'] == 'thermo' and hasattr(gui_instance, 'thermo_selected'):
-                gui_instance.thermo_selected()
-            elif instr['light_mode'] == 'osc' and hasattr(gui_instance, 'osc_selected'):
-                gui_instance.osc_selected()
-        if 'thermopile_address' in instr and hasattr(gui_instance, 'thermopile_address'):
-            set_var_value(gui_instance.thermopile_address, instr['thermopile_address'])
-
-        # Load measurement parameters
-        if 'measurement' in config:
-            meas = config['measurement']
-            if 'wavelength' in meas and hasattr(gui_instance, 'wavelength_entry'):
-                set_entry_value(gui_instance.wavelength_entry, meas['wavelength'])
-            if 'medium_x' in meas and hasattr(gui_instance, 'medium_x_entry'):
-                set_entry_value(gui_instance.medium_x_entry, meas['medium_x'])
-            if 'medium_y' in meas and hasattr(gui_instance, 'medium_y_entry'):
-                set_entry_value(gui_instance.medium_y_entry, meas['medium_y'])
-            if 'distance' in meas and hasattr(gui_instance, 'distance_entry'):
-                set_entry_value(gui_instance.distance_entry, meas['distance'])
-            if 'detector_area' in meas and hasattr(gui_instance, 'detector_area_entry'):
-                set_entry_value(gui_instance.detector_area_entry, meas['detector_area'])
-            if 'transimpedance_gain' in meas and hasattr(gui_instance, 'transimpedance_gain_entry'):
-                set_entry_value(gui_instance.transimpedance_gain_entry, meas['transimpedance_gain'])
-            if 'responsivity' in meas and hasattr(gui_instance, 'responsivity_entry'):
-                set_entry_value(gui_instance.responsivity_entry, meas['responsivity'])
-            if 'compute_abs_power' in meas and hasattr(gui_instance, 'computeAbsPower_var'):
-                set_var_value(gui_instance.computeAbsPower_var, meas['compute_abs_power'])
-                # Trigger the checkbox callback so entries enable/disable correctly
-                if hasattr(gui_instance, 'toggle_param_entries'):
-                    gui_instance.toggle_param_entries()
-
-        # Load TEC settings
-        if 'tec' in config:
-            tec = config['tec']
-            if 'tec_address' in tec and hasattr(gui_instance, 'tec_address'):
-                set_var_value(gui_instance.tec_address, tec['tec_address'])
-            if 'tec_temp' in tec and hasattr(gui_instance, 'tec_temp_entry'):
-                set_entry_value(gui_instance.tec_temp_entry, tec['tec_temp'])
+    if 'compute_abs_power' in changed.get('measurement', ()):
+        # Checkbox callback so entries enable/disable correctly
+        if hasattr(gui_instance, 'toggle_param_entries'):
+            gui_instance.toggle_param_entries()
         
     messagebox.showinfo('Success', f'Configuration loaded from:\n{filepath}')
 
@@ -1,5 +1,50 @@
 # Helper functions for instruments
 
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+# Opened resources by VISA address, shared by every caller in the process
+_resources = {}
+_resources_lock = threading.Lock()
+
+
+def open_instrument(rm, address, read_termination='\n', write_termination='\n',
+                    timeout=2000):
+    """
+    Open (once) and configure the resource at address.
+
+    Later calls for the same address return the already-open resource, so
+    repeated sweeps or several modules talking to one instrument do not pay
+    for a new VISA session each time. The settings apply on the first open.
+    """
+    with _resources_lock:
+        inst = _resources.get(address)
+        if inst is None:
+            inst = rm.open_resource(address)
+            inst.read_termination = read_termination
+            inst.write_termination = write_termination
+            inst.send_end = True
+            inst.timeout = timeout
+            _resources[address] = inst
+    return inst
+
+
+def close_instrument(address):
+    """Close a resource opened with open_instrument and forget it."""
+    with _resources_lock:
+        inst = _resources.pop(address, None)
+    if inst is not None:
+        inst.close()
+
+
+@atexit.register
+def close_all_instruments():
+    for address in list(_resources):
+        close_instrument(address)
+
 def init_keithley(rm, address, source_mode, compliance):
     """
     Initialize a Keithley SMU for CW measurements.
@@ -7,21 +52,65 @@ def init_keithley(rm, address, source_mode, compliance):
     source_mode: 'curr' or 'volt'
     compliance:  compliance value in A or V (already converted)
     """
-    k = rm.open_resource(address)
+    k = open_instrument(rm, address)
+    try:
+        _setup_keithley(k, source_mode, compliance)
+    except Exception:
+        # Do not leave a half-configured (or dead) session in the cache for
+        # the next sweep to pick up; it reopens from scratch instead
+        close_instrument(address)
+        raise
+    return k
 
-    k.write("*RST; status:preset; *CLS")
-    k.write(f"sour:func {source_mode}")
 
+def _setup_keithley(k, source_mode, compliance):
+    """Send the init_keithley setup to an open SMU session."""
     if source_mode == 'curr':
-        k.write("sens:func 'volt'")
-        k.write(f"sens:volt:prot:lev {compliance}")
-        k.write("sens:volt:range:auto on")
+        sense = ["sens:func 'volt'", f"sens:volt:prot:lev {compliance}",
+                 "sens:volt:range:auto on"]
     else:
-        k.write("sens:func 'curr'")
-        k.write(f"sens:curr:prot:lev {compliance}")
-        k.write("sens:curr:range:auto on")
+        sense = ["sens:func 'curr'", f"sens:curr:prot:lev {compliance}",
+                 "sens:curr:range:auto on"]
 
-    k.write("form:elem curr")
-    k.write("outp on")
+    # Replies stay ASCII (no form:data sreal): the sweeps read one value per
+    # read? and parse it as text, which a binary block would break
+    cmds = (["*RST", "status:preset", "*CLS", f"sour:func {source_mode}"] + sense +
+            ["form:elem curr", "outp on"])
 
-    return k
+    # Send the whole setup as one compound message (one GPIB transaction).
+    # Common (*) commands need no root; subsystem commands restart at ':'.
+    k.write(";".join(c if c.startswith('*') else ':' + c for c in cmds))
+    k.query("*OPC?")
+
+
+def _bus(resource):
+    """Interface a resource sits on, e.g. 'GPIB0' or 'USB0'."""
+    name = getattr(resource, 'resource_name', None) or getattr(resource, 'address', '')
+    return name.split('::')[0].upper()
+
+
+def query_concurrently(*jobs):
+    """
+    Run independent instrument reads at the same time.
+
+    jobs: (resource, func, *args) tuples, e.g. (k, k.query, "read?")
+    Returns the results in job order. Instruments on the same bus (two GPIB0
+    devices, say) cannot transfer at once, so their jobs share a worker and
+    run one after another; only different buses overlap.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=4)
+
+    groups = {}
+    for i, (resource, func, *args) in enumerate(jobs):
+        groups.setdefault(_bus(resource), []).append((i, func, args))
+
+    def run(group):
+        return [(i, func(*args)) for i, func, args in group]
+
+    results = [None] * len(jobs)
+    for future in [_executor.submit(run, g) for g in groups.values()]:
+        for i, value in future.result():
+            results[i] = value
+    return results
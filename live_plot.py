@@ -4,8 +4,14 @@ Live Plotting Module for Laser Measurement Suite
 Provides embedded matplotlib plots that update in real-time during measurements.
 """
 
+import queue
+import threading
+import time
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from matplotlib.transforms import nonsingular
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tkinter import LabelFrame
 
@@ -24,23 +30,57 @@ class LivePlot:
         # Inside measurement loop:
         self.live_plot.add_point(current_value, light_value)
         
-        # After measurement (optional - to show final plot in separate window):
-        self.live_plot.show_final()
+        # After measurement (draws points held back by the redraw throttle):
+        self.live_plot.flush()
     """
     
+    # Period (ms) of the Tk-side drain of add_point_async points, and the
+    # most points moved per tick so a backlog cannot stall the UI. The tick
+    # only runs while points are arriving
+    TICK_MS = 30
+    TICK_MAX_POINTS = 1000
+    
+    # Above this many points, markers are only drawn on an evenly spaced
+    # subset (the line itself still goes through every point)
+    MAX_MARKERS = 200
+    
+    # Longer sweeps are shown as this many evenly spaced points (more than
+    # the plot has pixel columns); save() always writes every point
+    MAX_DISPLAY_POINTS = 2000
+    
+    # Axis limits only ever grow while points arrive. When a point falls
+    # outside them the exceeded side is pushed out by LIMIT_HEADROOM times the
+    # data span, so a steady sweep needs few full redraws; reset(), set_data()
+    # and flush() fit the limits to the data with LIMIT_MARGIN instead
+    LIMIT_HEADROOM = 0.25
+    LIMIT_MARGIN = 0.05
+    
     def __init__(self, parent, xlabel="X", ylabel="Y", title="Live Measurement", 
-                 color='blue', ylabel2=None, color2='red'):
+                 color='blue', ylabel2=None, color2='red', draw_every=1,
+                 min_draw_interval=0.0, share_axis=False, figsize=(6, 4), dpi=100,
+                 constrained_layout=False):
         """
         Create a live plot embedded in a tkinter parent widget.
         
         Args:
-            parent: tkinter parent widget (Frame, LabelFrame, or Toplevel)
+            parent: tkinter parent widget (Frame, LabelFrame, or Toplevel), or
+                None for a headless plot that is only saved to file
             xlabel: Label for x-axis
             ylabel: Label for y-axis (primary)
             title: Plot title
             color: Line color for primary data
             ylabel2: Label for secondary y-axis (if dual-axis plot)
             color2: Line color for secondary data
+            draw_every: Redraw at most once per this many add_point calls
+            min_draw_interval: Minimum time (s) between redraws; points that
+                arrive sooner are drawn with the next redraw or by flush()
+            share_axis: Plot the secondary data on the primary y-axis (with a
+                legend) instead of a twin axis; for series on similar scales
+            figsize: Figure size in inches
+            dpi: Figure resolution for the live view (saved files use 150)
+            constrained_layout: Re-run the layout on every full redraw instead
+                of a single tight_layout() at construction (slower per draw, but
+                follows resizes and changing tick label widths)
         """
         self.parent = parent
         self.xlabel = xlabel
@@ -50,12 +90,50 @@ class LivePlot:
         self.color = color
         self.color2 = color2
         self.dual_axis = ylabel2 is not None
+        self.share_axis = share_axis and self.dual_axis
+        
+        # Redraw throttling
+        self._draw_every = draw_every
+        self._min_draw_interval = min_draw_interval
+        self._pending = 0
+        self._last_draw = 0.0
         
-        # Data storage
-        self.x_data = []
-        self.y_data = []
-        self.y2_data = []  # For dual-axis plots
+        # Data storage: float64 buffers that double when full; only the
+        # first self._n entries are valid
+        self._cap = 256
+        self._x = np.empty(self._cap)
+        self._y = np.empty(self._cap)
+        self._y2 = np.empty(self._cap)  # For dual-axis plots (NaN = no value)
+        self._n = 0
+        self._reset_extents()
        
+        # Create figure and axes
+        self.fig = Figure(figsize=figsize, dpi=dpi,
+                          layout='constrained' if constrained_layout else None)
+        self.ax = self.fig.add_subplot(111)
+        
+        if self.dual_axis and not self.share_axis:
+            self.ax2 = self.ax.twinx()
+        else:
+            self.ax2 = None
+        
+        # Create the canvas
+        self.canvas = self._make_canvas(parent)
+        
+        # Initialize plot elements
+        self._setup_plot()
+        
+        # Points from add_point_async (worker threads), drained on the Tk thread
+        self._queue = queue.Queue()
+        self._tick_lock = threading.Lock()
+        self._ticking = False
+    
+    def _make_canvas(self, parent):
+        """Embed the figure in parent, or give it a plain Agg canvas if headless."""
+        if parent is None:
+            self.frame = None
+            return FigureCanvasAgg(self.fig)
+        
         # Create the plot frame
         self.frame = LabelFrame(parent, text='Live Plot')
         self.frame.grid(row=0, column=0, padx=10, pady=10, sticky='NSEW')
@@ -68,22 +146,9 @@ class LivePlot:
         self.frame.columnconfigure(0, weight=1)
         self.frame.rowconfigure(0, weight=1)
         
-        # Create figure and axes
-        self.fig = Figure(figsize=(6, 4), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        
-        if self.dual_axis:
-            self.ax2 = self.ax.twinx()
-        else:
-            self.ax2 = None
-        
-        # Create the canvas
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
-        
-        # Initialize plot elements
-        self._setup_plot()
+        canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+        return canvas
     
     def _setup_plot(self):
         """Set up the initial plot appearance."""
@@ -102,28 +167,251 @@ class LivePlot:
             self.ax2.tick_params(axis='y', labelcolor=self.color2)
             self.line2, = self.ax2.plot([], [], color=self.color2, marker='s',
                                          markersize=3, linewidth=1.5, label=self.ylabel2)
+        elif self.share_axis:
+            self.line2, = self.ax.plot([], [], color=self.color2, marker='s',
+                                        markersize=3, linewidth=1.5, label=self.ylabel2)
+            self.ax.legend(loc='upper left')
         
-        self.fig.tight_layout()
+        if self.fig.get_layout_engine() is None:
+            self.fig.tight_layout()
+        
+        # Blitting: the data lines are animated (left out of full redraws) and
+        # painted over a cached copy of the static axes background
+        self.line.set_animated(True)
+        if self.dual_axis and hasattr(self, 'line2'):
+            self.line2.set_animated(True)
+        self._bg = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+    
+    def _on_draw(self, event):
+        """Re-capture the static background after every full redraw."""
+        if event.canvas is not self.canvas or self.canvas.is_saving():
+            return  # a file export (see save), not a redraw of the live plot
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+    
+    def _draw_lines(self):
+        self.ax.draw_artist(self.line)
+        if self.dual_axis and hasattr(self, 'line2'):
+            self.line2.axes.draw_artist(self.line2)
+    
+    def _blit(self):
+        """Repaint only the data lines over the cached background."""
+        self.canvas.restore_region(self._bg)
+        self._draw_lines()
+        self.canvas.blit(self.ax.bbox)
+    
+    def _reset_extents(self):
+        # Running [min, max] of the x, y and (twin axis only) y2 data
+        self._extents = np.array([[np.inf, -np.inf]] * 3)
+        self._refit = True
+    
+    def _update_limits(self, start):
+        """
+        Fold the points from index start onwards into the running extents and
+        grow the axis limits if needed. Returns True if any limit changed.
+        """
+        # Each axis is only rescaled for its own data, so the twin axis
+        # costs nothing while its series stays in range
+        y_data = (self._y, self._y2) if self.share_axis else (self._y,)
+        axes = [((self._x,), self.ax.get_xlim, self.ax.set_xlim),
+                (y_data, self.ax.get_ylim, self.ax.set_ylim)]
+        if self.dual_axis and self.ax2:
+            axes.append(((self._y2,), self.ax2.get_ylim, self.ax2.set_ylim))
+        
+        changed = False
+        for ext, (arrays, get_lim, set_lim) in zip(self._extents, axes):
+            for data in arrays:
+                values = data[start:self._n]
+                values = values[~np.isnan(values)]
+                if values.size:
+                    ext[0] = min(ext[0], values.min())
+                    ext[1] = max(ext[1], values.max())
+            if ext[0] > ext[1]:
+                continue  # no data on this axis yet
+            
+            lo, hi = get_lim()
+            span = ext[1] - ext[0]
+            if self._refit:
+                lo = ext[0] - span * self.LIMIT_MARGIN
+                hi = ext[1] + span * self.LIMIT_MARGIN
+            elif lo <= ext[0] and ext[1] <= hi:
+                continue
+            else:
+                if ext[0] < lo:
+                    lo = ext[0] - span * self.LIMIT_HEADROOM
+                if ext[1] > hi:
+                    hi = ext[1] + span * self.LIMIT_HEADROOM
+            set_lim(nonsingular(lo, hi))
+            changed = True
+        
+        self._refit = False
+        return changed
+    
+    def _redraw(self):
+        """Show every point added since the last redraw."""
+        start = self._n - self._pending
+        self._pending = 0
+        self._last_draw = time.monotonic()
+        
+        self._set_line_data()
+        
+        if self._update_limits(start) or self._bg is None:
+            # Limits changed: full redraw, which also re-captures the
+            # background (see _on_draw)
+            self.canvas.draw_idle()
+        else:
+            # Limits unchanged: only the lines need repainting
+            self._blit()
+    
+    def _set_line_data(self, full=False):
+        # Hand the lines the float64 buffers (no list conversion); x and y
+        # are set separately to skip set_data's unpacking
+        n = self._n
+        if full or n <= self.MAX_DISPLAY_POINTS:
+            shown = slice(0, n)
+        else:
+            shown = np.linspace(0, n - 1, self.MAX_DISPLAY_POINTS).astype(np.intp)
+        x = self._x[shown]
+        markevery = max(1, len(x) // self.MAX_MARKERS)
+        self.line.set_xdata(x)
+        self.line.set_ydata(self._y[shown])
+        self.line.set_markevery(markevery)
+        if self.dual_axis and hasattr(self, 'line2'):
+            self.line2.set_xdata(x)
+            self.line2.set_ydata(self._y2[shown])
+            self.line2.set_markevery(markevery)
+    
+    def flush(self):
+        """
+        Draw any points held back by the redraw throttle or still queued by
+        add_point_async, and fit the axis limits to the data (call at sweep
+        end, on the Tk thread).
+        """
+        self._drain()
+        self._refit = True
+        self._redraw()
+        if self.parent is not None:
+            self.parent.update_idletasks()
+    
+    @property
+    def x_data(self):
+        return self._x[:self._n]
+    
+    @property
+    def y_data(self):
+        return self._y[:self._n]
+    
+    @property
+    def y2_data(self):
+        return self._y2[:self._n]
+    
+    def _reserve(self, n):
+        """Grow the buffers (keeping their contents) to hold at least n points."""
+        if n <= self._cap:
+            return
+        while self._cap < n:
+            self._cap *= 2
+        self._x = np.resize(self._x, self._cap)
+        self._y = np.resize(self._y, self._cap)
+        self._y2 = np.resize(self._y2, self._cap)
     
     def reset(self):
         """Clear all data and reset the plot for a new measurement."""
-        self.x_data = []
-        self.y_data = []
-        self.y2_data = []
+        self._n = 0
+        self._pending = 0
+        
+        # Drop points still queued from an earlier run
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
         
         self.line.set_data([], [])
         if self.dual_axis and hasattr(self, 'line2'):
             self.line2.set_data([], [])
         
-        # Reset axis limits
-        self.ax.relim()
-        self.ax.autoscale_view()
-        if self.dual_axis and self.ax2:
-            self.ax2.relim()
-            self.ax2.autoscale_view()
+        # Axis limits are refitted from the first points of the next sweep
+        self._reset_extents()
         
         self.canvas.draw_idle()
-        self.parent.update()
+
+    def reconfigure(self, xlabel=None, ylabel=None, ylabel2=None, title=None):
+        """
+        Relabel the plot for another measurement type and clear it, reusing
+        this figure and canvas instead of building a new LivePlot.
+        
+        Arguments left as None keep their current value; ylabel2 only
+        applies to dual-axis plots.
+        """
+        if xlabel is not None:
+            self.xlabel = xlabel
+            self.ax.set_xlabel(xlabel)
+        if ylabel is not None:
+            self.ylabel = ylabel
+            self.ax.set_ylabel(ylabel, color=self.color)
+            self.line.set_label(ylabel)
+        if title is not None:
+            self.title = title
+            self.ax.set_title(title)
+        if ylabel2 is not None and self.dual_axis:
+            self.ylabel2 = ylabel2
+            self.line2.set_label(ylabel2)
+            if self.ax2:
+                self.ax2.set_ylabel(ylabel2, color=self.color2)
+        if self.share_axis:
+            self.ax.legend(loc='upper left')
+        
+        self.reset()
+    
+    def _append(self, x, y, y2):
+        n = self._n
+        self._reserve(n + 1)
+        self._x[n] = x
+        self._y[n] = y
+        self._y2[n] = np.nan if y2 is None else y2
+        self._n = n + 1
+        self._pending += 1
+    
+    def add_point_async(self, x, y, y2=None):
+        """
+        Queue a data point from a measurement running on a worker thread.
+        
+        Safe to call from any thread; matplotlib is only touched by the Tk
+        thread, which draws all queued points in one redraw per tick. The
+        first call starts the tick (tkinter forwards the after() call to the
+        Tk thread, whose mainloop must be running).
+        """
+        self._queue.put_nowait((x, y, y2))
+        with self._tick_lock:
+            if self._ticking or self.parent is None:
+                return  # already draining, or headless (flush() drains)
+            self._ticking = True
+        self.parent.after(self.TICK_MS, self._tick)
+    
+    def _drain(self, limit=None):
+        """Move up to limit queued points (all if None) into the buffers."""
+        while limit is None or limit > 0:
+            try:
+                self._append(*self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if limit is not None:
+                limit -= 1
+    
+    def _tick(self):
+        self._drain(self.TICK_MAX_POINTS)
+        if self._pending:
+            self._redraw()
+        with self._tick_lock:
+            # A point queued after this check finds _ticking False and
+            # restarts the tick itself
+            if self._queue.empty():
+                self._ticking = False
+                return
+        self.parent.after(self.TICK_MS, self._tick)
     
     def add_point(self, x, y, y2=None):
         """
@@ -134,28 +422,18 @@ class LivePlot:
             y: Y-axis value (primary)
             y2: Y-axis value (secondary, for dual-axis plots)
         """
-        self.x_data.append(x)
-        self.y_data.append(y)
-        
-        # Update primary line
-        self.line.set_data(self.x_data, self.y_data)
-        
-        # Update secondary line if dual-axis
-        if self.dual_axis and y2 is not None:
-            self.y2_data.append(y2)
-            if hasattr(self, 'line2'):
-                self.line2.set_data(self.x_data, self.y2_data)
-        
-        # Rescale axes
-        self.ax.relim()
-        self.ax.autoscale_view()
-        if self.dual_axis and self.ax2:
-            self.ax2.relim()
-            self.ax2.autoscale_view()
+        self._append(x, y, y2)
         
-        # Redraw
-        self.canvas.draw_idle()
-        self.parent.update()
+        # Redraw only every draw_every points and at most every
+        # min_draw_interval seconds
+        if (self._pending >= self._draw_every and
+                time.monotonic() - self._last_draw >= self._min_draw_interval):
+            self._redraw()
+            # A sweep calling this runs on the Tk thread: let Tk paint and
+            # handle input and timers once per redraw (not per point), so the
+            # window stays responsive
+            if self.parent is not None:
+                self.parent.update()
     
     def set_data(self, x_data, y_data, y2_data=None):
         """
@@ -166,24 +444,21 @@ class LivePlot:
             y_data: List of y values (primary)
             y2_data: List of y values (secondary, for dual-axis plots)
         """
-        self.x_data = list(x_data)
-        self.y_data = list(y_data)
+        x = np.asarray(x_data, dtype=np.float64)
+        n = len(x)
+        self._reserve(n)
+        self._x[:n] = x
+        self._y[:n] = np.asarray(y_data, dtype=np.float64)
+        self._y2[:n] = np.nan if y2_data is None else np.asarray(y2_data, dtype=np.float64)
+        self._n = n
+        self._pending = 0
         
-        self.line.set_data(self.x_data, self.y_data)
+        self._set_line_data()
         
-        if self.dual_axis and y2_data is not None:
-            self.y2_data = list(y2_data)
-            if hasattr(self, 'line2'):
-                self.line2.set_data(self.x_data, self.y2_data)
-        
-        self.ax.relim()
-        self.ax.autoscale_view()
-        if self.dual_axis and self.ax2:
-            self.ax2.relim()
-            self.ax2.autoscale_view()
+        self._reset_extents()
+        self._update_limits(0)
         
         self.canvas.draw_idle()
-        self.parent.update()
     
     def get_figure(self):
         """Return the matplotlib figure for saving."""
@@ -191,39 +466,48 @@ class LivePlot:
     
     def save(self, filepath):
         """Save the current plot to a file."""
-        self.fig.savefig(filepath, bbox_inches='tight', dpi=150)
+        # Render on a throwaway Agg canvas so the export never goes through
+        # the Tk canvas's draw path; the figure is then handed back to it
+        self._set_line_data(full=True)
+        try:
+            FigureCanvasAgg(self.fig).print_figure(filepath, bbox_inches='tight', dpi=150)
+        finally:
+            self.fig.set_canvas(self.canvas)
+            self._set_line_data()
 
 
 class LivePlotLI(LivePlot):
     """Preset for L-I (Light vs Current) measurements."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, **kwargs):
         super().__init__(
             parent,
             xlabel="Device Current (mA)",
             ylabel="Light Output (W)",
             title="L-I Characteristic (Live)",
-            color='blue'
+            color='blue',
+            **kwargs
         )
 
 
 class LivePlotIV(LivePlot):
     """Preset for I-V (Current vs Voltage) measurements."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, **kwargs):
         super().__init__(
             parent,
             xlabel="Device Current (mA)",
             ylabel="Device Voltage (mV)",
             title="I-V Characteristic (Live)",
-            color='green'
+            color='green',
+            **kwargs
         )
 
 
 class LivePlotLIV(LivePlot):
     """Preset for L-I-V (Light and Voltage vs Current) measurements."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, **kwargs):
         super().__init__(
             parent,
             xlabel="Device Current (mA)",
@@ -231,7 +515,8 @@ class LivePlotLIV(LivePlot):
             ylabel2="Light Output (W)",
             title="L-I-V Characteristic (Live)",
             color='blue',
-            color2='red'
+            color2='red',
+            **kwargs
         )
 
 
@@ -2,11 +2,16 @@
 # Written by K. Takahashi, 1 April 2026
 # Original OLMS code: Thanks to former OPREL staff and an Autumn 2025 OSU ECE capstone group!
 
-from time import sleep, strftime
+from time import sleep, strftime, monotonic
+from functools import lru_cache
 import numpy as np
 from numpy import append, zeros, arange, logspace, log10, size
 import os
+import queue
 import subprocess
+import threading
+import traceback
+from types import SimpleNamespace
 import matplotlib.pyplot as plt
 from tkinter import (Label, Entry, Button, LabelFrame, OptionMenu, Radiobutton,
                      StringVar, IntVar, BooleanVar, Checkbutton, DISABLED, NORMAL, Tk)
@@ -16,34 +21,78 @@ from Oscilloscope_Scaling import incrOscVertScale, channelImpedance
 from Update_Trigger import updateTriggerCursor
 from live_plot import LivePlotLIV
 from config_manager import add_config_buttons
-from instruments import init_keithley
+from instruments import init_keithley, query_concurrently, open_instrument, close_instrument
 from mock_instruments import get_resource_manager
 
-rm = get_resource_manager()
+@lru_cache(maxsize=None)
+def get_rm():
+    """Create the VISA resource manager on first use rather than at import."""
+    return get_resource_manager()
+
+# TEC readback interval bounds (s) and the drift rate (°C/s) below which the
+# reading counts as settled and the interval is allowed to grow
+TEC_POLL_MIN = 0.25
+TEC_POLL_MAX = 10.0
+TEC_SETTLED_RATE = 0.02
 
 # ── TEC ─────────────────────────────────────────────────────────────
 class LDC3724B_TEC:
     def __init__(self, rm, address):
-        self.inst = rm.open_resource(address)
+        self.address = address
+        # Terminators and timeout are set by open_instrument
+        self.inst = open_instrument(rm, address)
+        # Readback is polled from a worker thread; serialise access to the bus
+        self._lock = threading.Lock()
+        # This process is the only writer, so the output state is read once
+        # here and tracked locally afterwards
+        try:
+            self.output_state()
+        except Exception:
+            # Drop the cached session so the next attempt reopens it
+            close_instrument(address)
+            raise
+
+    def _query(self, *cmds):
+        # Several commands sent as one compound message -> one GPIB transaction
+        with self._lock:
+            return self.inst.query(";:".join(cmds))
+
+    def _write(self, cmd):
+        with self._lock:
+            self.inst.write(cmd)
 
     def set_temperature(self, temp_c):
-        self.inst.write(f"TEC:T {temp_c}")
+        self._write(f"TEC:T {temp_c}")
+
+    def set_temperature_and_enable(self, temp_c):
+        """Set the setpoint, switch the output on and read back in one transaction."""
+        t = float(self._query(f"TEC:T {temp_c}", "TEC:OUT 1", "TEC:T?").strip())
+        self._output_on = True
+        return t
 
     def get_temperature(self):
-        return float(self.inst.query("TEC:T?").strip())
+        return float(self._query("TEC:T?").strip())
 
     def output_on(self):
-        self.inst.write("TEC:OUT 1")
+        self._write("TEC:OUT 1")
+        self._output_on = True
 
     def output_off(self):
-        self.inst.write("TEC:OUT 0")
+        self._write("TEC:OUT 0")
+        self._output_on = False
 
     def output_state(self):
-        return self.inst.query("TEC:OUT?").strip() == "1"
+        """Query the instrument and resynchronise the cached output state."""
+        self._output_on = self._query("TEC:OUT?").strip() == "1"
+        return self._output_on
+
+    def toggle_output(self):
+        """Flip the output using the cached state, without a query."""
+        self.output_off() if self._output_on else self.output_on()
 
     def close(self):
         self.output_off()
-        self.inst.close()
+        close_instrument(self.address)
 
 
 # ── Unified LIV application ────────────────────────────────────────────────────
@@ -55,32 +104,32 @@ class LIV_App():
     # Shared instrument helpers
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _init_scope(self, pulse_width_us=None):
-        self.scope = rm.open_resource(self.scope_address.get())
+    def _init_scope(self, cfg, pulse_width_us=None):
+        self.scope = get_rm().open_resource(cfg.scope_address)
         self.scope.write("*RST")
         self.scope.write("*CLS")
         self.scope.write(":CHANnel%d:IMPedance %s" % (
-            self.light_channel.get(), channelImpedance(self.light_channel_impedance.get())))
+            cfg.light_channel, channelImpedance(cfg.light_channel_impedance)))
         self.scope.write(":CHANnel%d:IMPedance %s" % (
-            self.current_channel.get(), channelImpedance(self.curr_channel_impedance.get())))
+            cfg.current_channel, channelImpedance(cfg.curr_channel_impedance)))
         self.scope.write(":CHANnel%d:IMPedance %s" % (
-            self.voltage_channel.get(), channelImpedance(self.volt_channel_impedance.get())))
+            cfg.voltage_channel, channelImpedance(cfg.volt_channel_impedance)))
         if pulse_width_us is not None:
             self.scope.write(":TIMebase:RANGe %.6fus" % (0.5 * pulse_width_us * 10))
 
-    def _init_scope_channels(self, vs_l=0.001, vs_c=0.001, vs_v=0.001):
-        for ch, scale in [(self.light_channel.get(),   vs_l),
-                          (self.current_channel.get(), vs_c),
-                          (self.voltage_channel.get(), vs_v)]:
+    def _init_scope_channels(self, cfg, vs_l=0.001, vs_c=0.001, vs_v=0.001):
+        for ch, scale in [(cfg.light_channel,   vs_l),
+                          (cfg.current_channel, vs_c),
+                          (cfg.voltage_channel, vs_v)]:
             self.scope.write(":CHANNEL%d:SCALe %.3f" % (ch, scale))
             self.scope.write(":CHANnel%d:DISPlay ON" % ch)
             self.scope.write(":CHANnel%d:OFFset %.3fV" % (ch, 2 * scale))
         return {'light': 6*vs_l, 'current': 6*vs_c, 'voltage': 6*vs_v}
 
-    def _init_thermopile(self):
-        self.thermopile = rm.open_resource(self.thermopile_address.get())
+    def _init_thermopile(self, cfg):
+        self.thermopile = get_rm().open_resource(cfg.thermopile_address)
         id = self.thermopile.query("*IDN?")
-        wavelength = int(self.wavelength_entry.get())
+        wavelength = int(cfg.wavelength)
         if "integra" in id.upper():
             self.thermopile.write("*CSU")
             self.thermopile.timeout = 5000
@@ -101,30 +150,30 @@ class LIV_App():
             print("Thermopile read error")
             return 0.0
 
-    def _read_osc_amplitudes(self):
+    def _read_osc_amplitudes(self, cfg):
         def read(ch):
             return self.scope.query_ascii_values(
                 "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % ch)[0]
-        return (read(self.light_channel.get()),
-                read(self.current_channel.get()),
-                read(self.voltage_channel.get()))
-
-    def _adjust_all_scales(self, la, ca, va, vs_l, vs_c, vs_v, total):
-        vs_l = self.adjustVerticalScale(self.light_channel.get(),
-                   self.trigger_channel.get(), la, total['light'],   vs_l)
-        vs_c = self.adjustVerticalScale(self.current_channel.get(),
-                   self.trigger_channel.get(), ca, total['current'], vs_c)
-        vs_v = self.adjustVerticalScale(self.voltage_channel.get(),
-                   self.trigger_channel.get(), va, total['voltage'], vs_v)
+        return (read(cfg.light_channel),
+                read(cfg.current_channel),
+                read(cfg.voltage_channel))
+
+    def _adjust_all_scales(self, cfg, la, ca, va, vs_l, vs_c, vs_v, total):
+        vs_l = self.adjustVerticalScale(cfg.light_channel,
+                   cfg.trigger_channel, la, total['light'],   vs_l)
+        vs_c = self.adjustVerticalScale(cfg.current_channel,
+                   cfg.trigger_channel, ca, total['current'], vs_c)
+        vs_v = self.adjustVerticalScale(cfg.voltage_channel,
+                   cfg.trigger_channel, va, total['voltage'], vs_v)
         return vs_l, vs_c, vs_v, {'light': 6*vs_l, 'current': 6*vs_c, 'voltage': 6*vs_v}
 
-    def _update_trigger_cursors(self, la, ca, va, total):
-        trig = self.trigger_channel.get()
-        if trig == self.light_channel.get():
+    def _update_trigger_cursors(self, cfg, la, ca, va, total):
+        trig = cfg.trigger_channel
+        if trig == cfg.light_channel:
             updateTriggerCursor(la, self.scope, total['light'])
-        if trig == self.current_channel.get():
+        if trig == cfg.current_channel:
             updateTriggerCursor(ca, self.scope, total['current'])
-        if trig == self.voltage_channel.get():
+        if trig == cfg.voltage_channel:
             updateTriggerCursor(va, self.scope, total['voltage'])
 
     # ─────────────────────────────────────────────────────────────────────────
@@ -133,29 +182,28 @@ class LIV_App():
 
     def _ensure_dir(self, path):
         try:
-            if not os.path.exists(path):
-                os.makedirs(path)
+            os.makedirs(path, exist_ok=True)
         except Exception as e:
             print('Error creating directory %s: %s' % (path, e))
 
-    def _make_filename(self, prefix):
-        return (self.device_name_entry.get() + '_' + prefix + '_' +
-                self.device_temp_entry.get() + 'C_' +
-                self.device_dim_entry.get() + '_' +
-                self.test_laser_button_var.get())
+    def _make_filename(self, cfg, prefix):
+        return (cfg.device_name + '_' + prefix + '_' +
+                cfg.device_temp + 'C_' +
+                cfg.device_dim + '_' +
+                cfg.test_laser)
 
-    def _plot_string(self, test_type):
-        return ('Device Name: '   + self.device_name_entry.get() +
+    def _plot_string(self, cfg, test_type):
+        return ('Device Name: '   + cfg.device_name +
                 '\nTest Type: '   + test_type +
-                '\nTemperature (\u00B0C): ' + self.device_temp_entry.get() +
-                '\nDevice Dimensions: ' + self.device_dim_entry.get() +
+                '\nTemperature (\u00B0C): ' + cfg.device_temp +
+                '\nDevice Dimensions: ' + cfg.device_dim +
                 ' (\u03BCm x \u03BCm)' +
-                '\nTest Structure or Laser: ' + self.test_laser_button_var.get())
+                '\nTest Structure or Laser: ' + cfg.test_laser)
 
-    def _save_and_plot_pulsed(self, filename, lightData, currentData, voltageData, test_type):
+    def _save_and_plot_pulsed(self, cfg, filename, lightData, currentData, voltageData, test_type):
         """Save txt and matplotlib figure for CP and VP modes."""
-        self._ensure_dir(self.txt_dir_entry.get())
-        with open(self.txt_dir_entry.get() + '/' + filename + '.txt', 'w+') as fd:
+        self._ensure_dir(cfg.txt_dir)
+        with open(cfg.txt_dir + '/' + filename + '.txt', 'w+') as fd:
             fd.write('Device light output (W)\tCurrent (mA)\tVoltage (mV)\n')
             for i in range(len(currentData)):
                 fd.write('%s\t%s\t%s\n' % (lightData[i], currentData[i], voltageData[i]))
@@ -168,16 +216,16 @@ class LIV_App():
         ax1.plot(currentData, voltageData, color='blue', label='I-V Characteristic')
         ax2.plot(currentData, lightData,   color='red',  label='L-I Characteristic')
         ax1.legend(loc='upper left')
-        plt.figtext(0.02, 0.02, self._plot_string(test_type), fontsize=12)
+        plt.figtext(0.02, 0.02, self._plot_string(cfg, test_type), fontsize=12)
         plt.subplots_adjust(bottom=0.3)
-        self._ensure_dir(self.plot_dir_entry.get())
-        plt.savefig(self.plot_dir_entry.get() + '/' + filename + '.png')
+        self._ensure_dir(cfg.plot_dir)
+        plt.savefig(cfg.plot_dir + '/' + filename + '.png')
         plt.show()
 
-    def _save_and_plot_cw(self, filename, voltage_array, current, light):
+    def _save_and_plot_cw(self, cfg, filename, voltage_array, current, light):
         """Save txt and matplotlib figure for CW mode."""
-        self._ensure_dir(self.txt_dir_entry.get())
-        with open(self.txt_dir_entry.get() + '/' + filename + '.txt', 'w+') as fd:
+        self._ensure_dir(cfg.txt_dir)
+        with open(cfg.txt_dir + '/' + filename + '.txt', 'w+') as fd:
             fd.write('Device voltage (V)\tDevice current (A)\tPhotodetector output (W)\n')
             for i in range(len(voltage_array)):
                 fd.write('%s\t%s\t%s\n' % (round(voltage_array[i], 5), current[i], light[i]))
@@ -190,20 +238,20 @@ class LIV_App():
         ax1.plot(current, voltage_array, color='blue', label='I-V Characteristic')
         ax2.plot(current, light,         color='red',  label='L-I Characteristic')
         ax1.legend(loc='upper left')
-        plt.figtext(0.02, 0.02, self._plot_string('CW'), fontsize=12)
+        plt.figtext(0.02, 0.02, self._plot_string(cfg, 'CW'), fontsize=12)
         plt.subplots_adjust(bottom=0.3)
-        self._ensure_dir(self.plot_dir_entry.get())
-        plt.savefig(self.plot_dir_entry.get() + '/' + filename + '.png')
+        self._ensure_dir(cfg.plot_dir)
+        plt.savefig(cfg.plot_dir + '/' + filename + '.png')
         plt.show()
 
     # ─────────────────────────────────────────────────────────────────────────
     # Origin export (in development)
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _export_to_origin(self, filename, mode='pulsed'):
-        txt_path    = (self.txt_dir_entry.get()  + '/' + filename + '.txt').replace('\\', '/')
-        opj_path    = (self.plot_dir_entry.get() + '/' + filename + '.opj').replace('\\', '/')
-        script_path = (self.plot_dir_entry.get() + '/' + filename + '_import.ogs').replace('\\', '/')
+    def _export_to_origin(self, cfg, filename, mode='pulsed'):
+        txt_path    = (cfg.txt_dir  + '/' + filename + '.txt').replace('\\', '/')
+        opj_path    = (cfg.plot_dir + '/' + filename + '.opj').replace('\\', '/')
+        script_path = (cfg.plot_dir + '/' + filename + '_import.ogs').replace('\\', '/')
         origin_exe  =  r"C:\Program Files (x86)\Origin Lab\Origin85\Origin85.exe"
 
         if mode == 'pulsed':
@@ -265,78 +313,77 @@ save "{opj_path}";
 
     # ─────────────────────────────────────────────────────────────────────────
     # Sweep functions: Constant wave, Voltage pulsed, Current pulsed.
+    # Run on a worker thread (see start_sweep) with the settings in cfg; each
+    # returns a function that saves, plots and exports on the Tk thread.
     # ─────────────────────────────────────────────────────────────────────────
 
-    def run_cw(self):
-        use_thermo = self.light_mode_var.get() == 'thermo'
+    def run_cw(self, cfg):
+        use_thermo = cfg.light_mode == 'thermo'
 
         # ── Initialise instruments ────────────────────────────────────────────
-        compliance = float(self.compliance_entry.get()) / 1000
-        self.keithley = init_keithley(rm, self.smu_address.get(),
+        compliance = float(cfg.compliance) / 1000
+        self.keithley = init_keithley(get_rm(), cfg.smu_address,
                                       source_mode='volt', compliance=compliance)
         if use_thermo:
-            self._init_thermopile()
+            self._init_thermopile(cfg)
         else:
-            self.scope = rm.open_resource(self.scope_address.get())
+            self.scope = get_rm().open_resource(cfg.scope_address)
             self.scope.write("*RST"); self.scope.write("*CLS")
             self.scope.write(":CHANnel%d:IMPedance %s" % (
-                self.light_channel.get(),
-                channelImpedance(self.light_channel_impedance.get())))
+                cfg.light_channel,
+                channelImpedance(cfg.light_channel_impedance)))
             self.scope.write(":TIMebase:RANGe 2E-6")
             vs_light    = 0.001
             total_light = 6 * vs_light
-            self.scope.write(":CHANNEL%d:SCALe %.3f" % (self.light_channel.get(), vs_light))
-            self.scope.write(":CHANnel%d:DISPlay ON" % self.light_channel.get())
-            self.scope.write(":CHANnel%d:OFFset %.3fV" % (self.light_channel.get(), 2*vs_light))
+            self.scope.write(":CHANNEL%d:SCALe %.3f" % (cfg.light_channel, vs_light))
+            self.scope.write(":CHANnel%d:DISPlay ON" % cfg.light_channel)
+            self.scope.write(":CHANnel%d:OFFset %.3fV" % (cfg.light_channel, 2*vs_light))
 
         # ── Build voltage sweep array ─────────────────────────────────────────
-        if self.sweep_var.get() == 'Lin':
-            step  = round(float(self.step_size_entry.get()) / 1000, 3)
-            start = float(self.start_entry.get())
-            stop  = float(self.stop_entry.get())
+        if cfg.sweep == 'Lin':
+            step  = round(float(cfg.step_size) / 1000, 3)
+            start = float(cfg.start)
+            stop  = float(cfg.stop)
             arr   = arange(start, stop, step)
             voltage_array = append(arr, stop)
         else:
-            pos = logspace(-4, log10(float(self.stop_entry.get())),
-                           int(self.num_pts_entry.get()) // 2)
-            neg = -logspace(log10(abs(float(self.start_entry.get()))),
-                            -4, int(self.num_pts_entry.get()) // 2)
+            pos = logspace(-4, log10(float(cfg.stop)),
+                           int(cfg.num_pts) // 2)
+            neg = -logspace(log10(abs(float(cfg.start))),
+                            -4, int(cfg.num_pts) // 2)
             voltage_array = append(neg, pos)
 
         current = zeros(len(voltage_array), float)
         light   = zeros(len(voltage_array), float)
-        self.live_plot.reset()
 
         # ── Sweep loop ────────────────────────────────────────────────────────
         for i in range(len(voltage_array)):
-            # Set voltage via SMU
-            k = rm.open_resource(self.smu_address.get())
-            k.write("sour:func volt")
-            k.write("sens:curr:rang:auto on")
-            k.write("sens:func 'curr'")
-            k.write("form:elem curr")
-            k.write("outp on")
-            k.write("sour:volt:lev " + str(round(voltage_array[i], 3)))
-            k.query('READ?')
+            # Set voltage via SMU (already configured by init_keithley)
+            self.keithley.write("sour:volt:lev " + str(round(voltage_array[i], 3)))
+            self.keithley.query('READ?')
             sleep(0.1)
 
-            current[i] = eval(self.keithley.query("read?"))
-
-            # ── Light reading branch ──────────────────────────────────────────
+            # ── Current + light reading, both instruments at once ─────────────
             if use_thermo:
-                light[i] = self._read_thermopile()
+                reading, light[i] = query_concurrently(
+                    (self.keithley, self.keithley.query, "read?"),
+                    (self.thermopile, self._read_thermopile))
             else:
-                l = self.scope.query_ascii_values(
-                    "SINGLE;*OPC;:MEASure:VMAX? CHANNEL%d" % self.light_channel.get())[0]
+                reading, l = query_concurrently(
+                    (self.keithley, self.keithley.query, "read?"),
+                    (self.scope, self.scope.query_ascii_values,
+                     "SINGLE;*OPC;:MEASure:VMAX? CHANNEL%d" % cfg.light_channel))
+                l = l[0]
                 while l > 0.9 * total_light:
                     vs_light    = incrOscVertScale(vs_light)
                     total_light = 6 * vs_light
-                    self.scope.write(":CHANNEL%d:SCALe %.3f" % (self.light_channel.get(), vs_light))
+                    self.scope.write(":CHANNEL%d:SCALe %.3f" % (cfg.light_channel, vs_light))
                     l = self.scope.query_ascii_values(
-                        "SINGLE;*OPC;:MEASure:VMAX? CHANNEL%d" % self.light_channel.get())[0]
+                        "SINGLE;*OPC;:MEASure:VMAX? CHANNEL%d" % cfg.light_channel)[0]
                 light[i] = l
+            current[i] = eval(reading)
 
-            self.live_plot.add_point(current[i]*1000, voltage_array[i]*1000, light[i]*1000)
+            self.live_plot.add_point_async(current[i]*1000, voltage_array[i]*1000, light[i]*1000)
 
         # ── Shutdown ──────────────────────────────────────────────────────────
         self.keithley.write("outp off")
@@ -345,44 +392,46 @@ save "{opj_path}";
         else:
             self.scope.write(":STOP")
 
-        filename = self._make_filename('CW-LIV')
-        self._save_and_plot_cw(filename, voltage_array, current, light)
-        self._export_to_origin(filename, mode='cw')
+        filename = self._make_filename(cfg, 'CW-LIV')
+
+        def finish():
+            self._save_and_plot_cw(cfg, filename, voltage_array, current, light)
+            self._export_to_origin(cfg, filename, mode='cw')
+        return finish
 
     # ─────────────────────────────────────────────────────────────────────────
 
-    def run_cp(self):
-        use_thermo = self.light_mode_var.get() == 'thermo'
+    def run_cp(self, cfg):
+        use_thermo = cfg.light_mode == 'thermo'
 
         # ── Initialise instruments ────────────────────────────────────────────
-        self._init_scope(pulse_width_us=float(self.pulse_width_entry.get()) * 2)
+        self._init_scope(cfg, pulse_width_us=float(cfg.pulse_width) * 2)
         if use_thermo:
-            self._init_thermopile()
+            self._init_thermopile(cfg)
 
-        self.pulser = rm.open_resource(self.pulser_address.get())
+        self.pulser = get_rm().open_resource(cfg.pulser_address)
         self.pulser.write("*RST"); self.pulser.write("*CLS")
-        self.pulser.write(":PW "      + self.pulse_width_entry.get())
+        self.pulser.write(":PW "      + cfg.pulse_width)
         self.pulser.write(":DIS:LDI")
-        self.pulser.write("LIMit:I "  + self.curr_limit_entry.get())
+        self.pulser.write("LIMit:I "  + cfg.curr_limit)
         self.pulser.write("OUTPut OFF")
 
         # ── Trigger setup ─────────────────────────────────────────────────────
         self.scope.write(":TRIGger:MODE EDGE")
-        self.scope.write(":TRIGger:EDGE:SOURce CHANnel%d" % self.trigger_channel.get())
+        self.scope.write(":TRIGger:EDGE:SOURce CHANnel%d" % cfg.trigger_channel)
         self.scope.write(":TRIGger:LEVel:ASETup")
 
         vs_l, vs_c, vs_v = 0.001, 0.002, 0.002
-        total = self._init_scope_channels(vs_l, vs_c, vs_v)
+        total = self._init_scope_channels(cfg, vs_l, vs_c, vs_v)
 
         # ── Current sweep values ──────────────────────────────────────────────
-        start = float(self.start_entry.get())
-        stop  = float(self.stop_entry.get())  + float(self.step_size_entry.get())
-        step  = float(self.step_size_entry.get())
+        start = float(cfg.start)
+        stop  = float(cfg.stop)  + float(cfg.step_size)
+        step  = float(cfg.step_size)
         currentSourceValues = np.arange(start, stop, step)
 
         lightData, currentData, voltageData = [0], [0], [0]
-        self.live_plot.reset()
-        self.live_plot.add_point(0, 0, 0)
+        self.live_plot.add_point_async(0, 0, 0)
 
         # ── Sweep loop ────────────────────────────────────────────────────────
         for I_s in currentSourceValues:
@@ -396,30 +445,30 @@ save "{opj_path}";
             if use_thermo:
                 la = self._read_thermopile()
             else:
-                la, _, _ = self._read_osc_amplitudes()
+                la, _, _ = self._read_osc_amplitudes(cfg)
 
             ca = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.current_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.current_channel)[0]
             va = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.voltage_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.voltage_channel)[0]
 
-            self._update_trigger_cursors(la, ca, va, total)
-            vs_l, vs_c, vs_v, total = self._adjust_all_scales(la, ca, va, vs_l, vs_c, vs_v, total)
+            self._update_trigger_cursors(cfg, la, ca, va, total)
+            vs_l, vs_c, vs_v, total = self._adjust_all_scales(cfg, la, ca, va, vs_l, vs_c, vs_v, total)
 
             # Second reading after scale adjustment
             if use_thermo:
                 la = self._read_thermopile()
             else:
-                la, _, _ = self._read_osc_amplitudes()
+                la, _, _ = self._read_osc_amplitudes(cfg)
 
             ca = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.current_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.current_channel)[0]
             va = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.voltage_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.voltage_channel)[0]
 
             cd = 2 * ca
             lightData.append(la); currentData.append(cd); voltageData.append(va)
-            self.live_plot.add_point(cd*1000, va*1000, la*1000)
+            self.live_plot.add_point_async(cd*1000, va*1000, la*1000)
 
         # ── Shutdown ──────────────────────────────────────────────────────────
         currentData[:] = [x*1000 for x in currentData]
@@ -429,52 +478,55 @@ save "{opj_path}";
         if use_thermo:
             self.thermopile.write("*CSU")
 
-        filename = self._make_filename('CP-LIV')
-        self._save_and_plot_pulsed(filename, lightData, currentData, voltageData, 'Current Pulsed')
-        self._export_to_origin(filename, mode='pulsed')
+        filename = self._make_filename(cfg, 'CP-LIV')
+
+        def finish():
+            self._save_and_plot_pulsed(cfg, filename, lightData, currentData, voltageData,
+                                       'Current Pulsed')
+            self._export_to_origin(cfg, filename, mode='pulsed')
+        return finish
 
     # ─────────────────────────────────────────────────────────────────────────
 
-    def run_vp(self):
-        use_thermo = self.light_mode_var.get() == 'thermo'
-        pulseWidth = float(self.pulse_width_entry.get())
+    def run_vp(self, cfg):
+        use_thermo = cfg.light_mode == 'thermo'
+        pulseWidth = float(cfg.pulse_width)
 
         # ── Initialise instruments ────────────────────────────────────────────
-        self._init_scope(pulse_width_us=pulseWidth)
+        self._init_scope(cfg, pulse_width_us=pulseWidth)
         if use_thermo:
-            self._init_thermopile()
+            self._init_thermopile(cfg)
 
-        self.pulser = rm.open_resource(self.pulser_address.get())
+        self.pulser = get_rm().open_resource(cfg.pulser_address)
         self.pulser.write("*RST"); self.pulser.write("*CLS")
         self.pulser.write("OUTPut:IMPedance 50")
         self.pulser.write("SOURce INTernal")
-        self.pulser.write("PULSe:WIDTh " + self.pulse_width_entry.get() + "us")
-        self.pulser.write("FREQuency "   + self.frequency_entry.get()   + "kHz")
+        self.pulser.write("PULSe:WIDTh " + cfg.pulse_width + "us")
+        self.pulser.write("FREQuency "   + cfg.frequency   + "kHz")
         self.pulser.write("OUTPut ON")
 
         # ── Trigger setup ─────────────────────────────────────────────────────
         self.scope.write(":TRIGger:MODE GLITch")
-        self.scope.write(":TRIGger:GLITch:SOURce CHANnel%d" % self.trigger_channel.get())
+        self.scope.write(":TRIGger:GLITch:SOURce CHANnel%d" % cfg.trigger_channel)
         self.scope.write(":TRIGger:GLITch:QUALifier RANGe")
         self.scope.write(":TRIGger:GLITch:RANGe %.6fus,%.6fus" % (
             pulseWidth*0.5, pulseWidth*1.5))
         self.scope.write("TRIGger:GLITch:LEVel 1E-3")
 
         vs_l, vs_c, vs_v = 0.001, 0.001, 0.001
-        total   = self._init_scope_channels(vs_l, vs_c, vs_v)
-        seriesR = float(self.series_res_entry.get())
+        total   = self._init_scope_channels(cfg, vs_l, vs_c, vs_v)
+        seriesR = float(cfg.series_res)
 
         # ── Voltage sweep values ──────────────────────────────────────────────
-        start = float(self.start_entry.get())
-        stop  = float(self.stop_entry.get())  + float(self.step_size_entry.get()) / 1000
-        step  = float(self.step_size_entry.get()) / 1000
+        start = float(cfg.start)
+        stop  = float(cfg.stop)  + float(cfg.step_size) / 1000
+        step  = float(cfg.step_size) / 1000
         voltageSourceValues = np.arange(start, stop, step)
 
         V_glitches = [7.12, 21.6, 68]
         prevV = 0
         lightData, currentData, voltageData = [0], [0], [0]
-        self.live_plot.reset()
-        self.live_plot.add_point(0, 0, 0)
+        self.live_plot.add_point_async(0, 0, 0)
 
         # ── Sweep loop ────────────────────────────────────────────────────────
         for V_s in voltageSourceValues:
@@ -491,31 +543,31 @@ save "{opj_path}";
             if use_thermo:
                 la = self._read_thermopile()
             else:
-                la, _, _ = self._read_osc_amplitudes()
+                la, _, _ = self._read_osc_amplitudes(cfg)
 
             ca = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.current_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.current_channel)[0]
             va = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.voltage_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.voltage_channel)[0]
 
-            self._update_trigger_cursors(la, ca, va, total)
-            vs_l, vs_c, vs_v, total = self._adjust_all_scales(la, ca, va, vs_l, vs_c, vs_v, total)
+            self._update_trigger_cursors(cfg, la, ca, va, total)
+            vs_l, vs_c, vs_v, total = self._adjust_all_scales(cfg, la, ca, va, vs_l, vs_c, vs_v, total)
 
             # Second reading after scale adjustment
             if use_thermo:
                 la = self._read_thermopile()
             else:
-                la, _, _ = self._read_osc_amplitudes()
+                la, _, _ = self._read_osc_amplitudes(cfg)
 
             ca = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.current_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.current_channel)[0]
             va = self.scope.query_ascii_values(
-                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % self.voltage_channel.get())[0]
+                "SINGLE;*OPC;:MEASure:VAMPlitude? CHANNEL%d" % cfg.voltage_channel)[0]
 
             cd = 2 * ca
             vd = va - seriesR * cd
             lightData.append(la); currentData.append(cd); voltageData.append(vd)
-            self.live_plot.add_point(cd*1000, vd*1000, la*1000)
+            self.live_plot.add_point_async(cd*1000, vd*1000, la*1000)
             prevV = V_s
 
         # ── Shutdown ──────────────────────────────────────────────────────────
@@ -526,17 +578,75 @@ save "{opj_path}";
         if use_thermo:
             self.thermopile.write("*CSU")
 
-        filename = self._make_filename('VP-LIV')
-        self._save_and_plot_pulsed(filename, lightData, currentData, voltageData, 'Voltage Pulsed')
-        self._export_to_origin(filename, mode='pulsed')
+        filename = self._make_filename(cfg, 'VP-LIV')
+
+        def finish():
+            self._save_and_plot_pulsed(cfg, filename, lightData, currentData, voltageData,
+                                       'Voltage Pulsed')
+            self._export_to_origin(cfg, filename, mode='pulsed')
+        return finish
 
     # ─────────────────────────────────────────────────────────────────────────
-    # Mode / sensor switching
+    # Sweep control
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _update_start_command(self, *args):
+    def _read_settings(self):
+        """Snapshot every setting a sweep uses (Tk variables are Tk-thread only)."""
+        names = {
+            'light_mode': self.light_mode_var, 'sweep': self.sweep_var,
+            'test_laser': self.test_laser_button_var,
+            'smu_address': self.smu_address, 'scope_address': self.scope_address,
+            'pulser_address': self.pulser_address,
+            'thermopile_address': self.thermopile_address,
+            'light_channel': self.light_channel, 'current_channel': self.current_channel,
+            'voltage_channel': self.voltage_channel, 'trigger_channel': self.trigger_channel,
+            'light_channel_impedance': self.light_channel_impedance,
+            'curr_channel_impedance': self.curr_channel_impedance,
+            'volt_channel_impedance': self.volt_channel_impedance,
+            'start': self.start_entry, 'stop': self.stop_entry,
+            'step_size': self.step_size_entry, 'num_pts': self.num_pts_entry,
+            'compliance': self.compliance_entry, 'pulse_width': self.pulse_width_entry,
+            'frequency': self.frequency_entry, 'series_res': self.series_res_entry,
+            'curr_limit': self.curr_limit_entry, 'wavelength': self.wavelength_entry,
+            'device_name': self.device_name_entry, 'device_temp': self.device_temp_entry,
+            'device_dim': self.device_dim_entry,
+            'txt_dir': self.txt_dir_entry, 'plot_dir': self.plot_dir_entry,
+        }
+        return SimpleNamespace(**{k: w.get() for k, w in names.items()})
+
+    def start_sweep(self):
+        # The sweep runs on a worker thread so the window stays responsive;
+        # Start stays disabled until its results are back (_finish_sweep)
+        if self._sweep_running:
+            return
         dispatch = {'CW': self.run_cw, 'CP': self.run_cp, 'VP': self.run_vp}
-        self.start_button.config(command=dispatch[self.mode_var.get()])
+        run = dispatch[self.mode_var.get()]
+        cfg = self._read_settings()
+        self._sweep_running = True
+        self.start_button.config(state=DISABLED)
+        self.live_plot.reset()
+        threading.Thread(target=self._sweep_worker, args=(run, cfg), daemon=True).start()
+
+    def _sweep_worker(self, run, cfg):
+        # Worker thread: instrument I/O only. The sweep returns the steps that
+        # touch Tk, pyplot or Origin, and those run on the Tk thread.
+        try:
+            finish = run(cfg)
+        except Exception:
+            traceback.print_exc()
+            finish = None
+        self.master.after(0, self._finish_sweep, finish)
+
+    def _finish_sweep(self, finish):
+        self.live_plot.flush()
+        self._sweep_running = False
+        self.start_button.config(state=NORMAL)
+        if finish is not None:
+            finish()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Mode / sensor switching
+    # ─────────────────────────────────────────────────────────────────────────
 
     def _on_mode_change(self, *args):
         mode = self.mode_var.get()
@@ -564,7 +674,6 @@ save "{opj_path}";
             self.series_res_label.grid(); self.series_res_entry.grid()
             self.curr_limit_label.grid_remove(); self.curr_limit_entry.grid_remove()
             self.frequency_label.grid(); self.frequency_entry.grid()
-        self._update_start_command()
 
     def _on_format_change(self, *args):
         print('poo')
@@ -584,27 +693,84 @@ save "{opj_path}";
     # TEC
     # ─────────────────────────────────────────────────────────────────────────
 
-    def init_tec(self):
-        if not hasattr(self, 'tec'):
-            self.tec = LDC3724B_TEC(rm, self.tec_address.get())
+    def _submit_tec(self, job):
+        # Queue an instrument job for the TEC worker; the Tk thread never
+        # waits on GPIB. Tk variables are read here, on the Tk thread.
+        self._tec_jobs.put((self.tec_address.get(), job))
+        self._tec_wake.set()
 
     def set_tec_temp(self):
-        self.init_tec()
-        self.tec.set_temperature(float(self.tec_temp_entry.get()))
-        self.tec.output_on()
+        # Trailing-edge debounce: a burst of clicks sends a single setpoint
+        if self._tec_temp_after_id is not None:
+            self.master.after_cancel(self._tec_temp_after_id)
+        self._tec_temp_after_id = self.master.after(150, self._send_tec_temp)
+
+    def _send_tec_temp(self):
+        self._tec_temp_after_id = None
+        temp_c = float(self.tec_temp_entry.get())
+        self._submit_tec(lambda tec: self._apply_tec_temp(tec, temp_c))
+
+    def _apply_tec_temp(self, tec, temp_c):
+        t = tec.set_temperature_and_enable(temp_c)
+        self._tec_readings.put(f'Current: {t:.2f} °C')
+        # New setpoint: expect drift, so poll quickly again
+        self._tec_interval = TEC_POLL_MIN
 
     def toggle_tec(self):
-        self.init_tec()
-        self.tec.output_off() if self.tec.output_state() else self.tec.output_on()
+        self._submit_tec(LDC3724B_TEC.toggle_output)
 
-    def update_tec_readback(self):
-        if hasattr(self, 'tec'):
+    def _run_tec_jobs(self):
+        while not self._tec_jobs.empty():
+            address, job = self._tec_jobs.get_nowait()
             try:
-                t = self.tec.get_temperature()
-                self.tec_status.config(text=f'Current: {t:.2f} °C')
-            except Exception:
-                self.tec_status.config(text='TEC read error')
-        self.master.after(1000, self.update_tec_readback)
+                if not hasattr(self, 'tec'):
+                    self.tec = LDC3724B_TEC(get_rm(), address)
+                job(self.tec)
+            except Exception as e:
+                print('TEC error: %s' % e)
+                self._tec_readings.put('TEC error')
+
+    def _poll_tec(self):
+        # Worker thread: opening the TEC, button actions and the readback
+        # query all run here, never on the Tk thread.
+        # The interval doubles while the temperature is settled and halves
+        # while it drifts, so steady state costs a query every few seconds.
+        last_t = last_time = None
+        while not self._tec_stop.is_set():
+            self._run_tec_jobs()
+            tec = getattr(self, 'tec', None)
+            if tec is not None:
+                try:
+                    t = tec.get_temperature()
+                    now = monotonic()
+                    if last_t is not None:
+                        rate = abs(t - last_t) / (now - last_time)
+                        if rate < TEC_SETTLED_RATE:
+                            self._tec_interval = min(self._tec_interval * 2, TEC_POLL_MAX)
+                        else:
+                            self._tec_interval = max(self._tec_interval / 2, TEC_POLL_MIN)
+                    last_t, last_time = t, now
+                    self._tec_readings.put(f'Current: {t:.2f} °C')
+                except Exception:
+                    self._tec_readings.put('TEC read error')
+            self._tec_wake.wait(self._tec_interval)
+            self._tec_wake.clear()
+
+    def _on_close(self):
+        self._tec_stop.set()
+        self._tec_wake.set()
+        self.master.destroy()
+
+    def update_tec_readback(self):
+        # Tk side: show the newest text posted by _poll_tec, no instrument I/O
+        text = None
+        while not self._tec_readings.empty():
+            text = self._tec_readings.get_nowait()
+        # Only touch the label when the text changes (no Tk relayout otherwise)
+        if text is not None and text != self._tec_status_text:
+            self.tec_status.config(text=text)
+            self._tec_status_text = text
+        self.master.after(100, self.update_tec_readback)
 
     # ─────────────────────────────────────────────────────────────────────────
     # GUI
@@ -752,7 +918,7 @@ save "{opj_path}";
         instrFrame = LabelFrame(self.master, text='Instrument Settings')
         instrFrame.grid(row=3, column=0, columnspan=3, sticky='EW', padx=5, pady=5)
 
-        connected_addresses = list(rm.list_resources()) or ['No devices detected.']
+        connected_addresses = list(get_rm().list_resources()) or ['No devices detected.']
 
         self.smu_address        = StringVar(value='Select...')
         self.pulser_address     = StringVar(value='Select...')
@@ -830,8 +996,10 @@ save "{opj_path}";
         self.tec_temp_entry = Entry(tecFrame, width=6)
         self.tec_temp_entry.grid(row=1, column=1)
 
-        self.tec_status = Label(tecFrame, text='Current: --- \u00B0C')
+        self._tec_status_text = 'Current: --- \u00B0C'
+        self.tec_status = Label(tecFrame, text=self._tec_status_text)
         self.tec_status.grid(row=2, column=0, columnspan=2)
+        self._tec_temp_after_id = None
 
         Button(tecFrame, text='Send Temp.',
                command=self.set_tec_temp).grid(row=3, column=0)
@@ -841,18 +1009,27 @@ save "{opj_path}";
         # ── Live plot ─────────────────────────────────────────────────────────
         plotFrame = LabelFrame(self.master, text='Live Plot')
         plotFrame.grid(row=4, column=0, columnspan=3, sticky='NSEW', padx=5, pady=5)
-        self.live_plot = LivePlotLIV(plotFrame)
+        self.live_plot = LivePlotLIV(plotFrame, min_draw_interval=0.05)
 
         # ── Start button ──────────────────────────────────────────────────────
+        self._sweep_running = False
         self.start_button = Button(self.master, text='Start',
-                                   width=15, command=self.run_cw)
+                                   width=15, command=self.start_sweep)
         self.start_button.grid(row=5, column=0, columnspan=3, pady=10)
 
         # Trigger initial layout
         self._on_mode_change()
         self._on_format_change()
         self._on_light_mode_change()
+
+        self._tec_readings = queue.Queue()
+        self._tec_jobs = queue.Queue()
+        self._tec_stop = threading.Event()
+        self._tec_wake = threading.Event()
+        self._tec_interval = 1.0
+        threading.Thread(target=self._poll_tec, daemon=True).start()
         self.update_tec_readback()
+        self.master.protocol('WM_DELETE_WINDOW', self._on_close)
 
 
 # ── Entry point ────────────────────────────────────────────────────────────────
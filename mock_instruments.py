@@ -17,73 +17,109 @@ Usage:
         python "OPREL Laser Measurement Suite.py"
 """
 
+import logging
 import os
-import random
 import math
+import re
 from time import sleep
 
+import numpy as np
+
+_log = logging.getLogger(__name__)
+
 # Set this to True to force mock mode, or use environment variable
 USE_MOCK_INSTRUMENTS = os.environ.get('MOCK_INSTRUMENTS', '0') == '1'
 
+# Shared generator for simulated measurement noise (NumPy bit generators
+# carry their own lock, so concurrent instrument queries can share it)
+_RNG = np.random.default_rng()
+
+# Leading numeric value of an upper-cased argument, e.g. 1.5V, 2.5US, 1E-3
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:E[-+]?\d+)?')
+
+# Upper-cased channel header node, long or short form (e.g. CHANNEL1 or CHAN1)
+_CHANNEL_RE = re.compile(r'CHAN(?:NEL)?(\d+)')
+
+
+def _short_form(node):
+    """SCPI short form of an upper-cased header node: 4 letters, 3 if the 4th is a vowel"""
+    short = node[:4]
+    return short[:3] if short[3:] in ('A', 'E', 'I', 'O', 'U') else short
+
+
+def _number(arg):
+    """Parse the leading number of an upper-cased SCPI argument; any unit suffix is ignored"""
+    match = _NUMBER_RE.match(arg)
+    if match is None:
+        raise ValueError(f"not a number: {arg!r}")
+    return float(match.group())
+
 
 class MockInstrument:
     """Base class for mock VISA instruments"""
     
     def __init__(self, address):
         self.address = address
-        self._settings = {}
         self._output_on = False
         self._voltage = 0.0
         self._current = 0.0
-        print(f"[MOCK] Connected to simulated instrument at {address}")
+        _log.debug("Connected to simulated instrument at %s", address)
     
     def write(self, command):
-        """Simulate writing a command to the instrument"""
-        cmd_upper = command.upper()
-        
-        # Parse common commands
-        if "*RST" in cmd_upper:
-            self._reset()
-        elif "*CLS" in cmd_upper:
-            pass  # Clear status - no action needed
-        elif "OUTPUT ON" in cmd_upper or "OUTP ON" in cmd_upper:
+        """Simulate writing a (possibly ';'-compound) message to the instrument"""
+        for part in command.split(';'):
+            if part.strip():
+                self._write_command(part.strip())
+    
+    def _write_command(self, command):
+        """Simulate a single command by dispatching on its header"""
+        header, _, arg = command.upper().partition(' ')
+        try:
+            self._dispatch(header.lstrip(':').split(':'), arg.strip())
+        except ValueError:
+            pass  # Unparseable argument - ignore like a lenient instrument
+    
+    def _dispatch(self, nodes, arg):
+        """Call the handler for the first header node (matched on its short form)"""
+        handler = self._HANDLERS.get(_short_form(nodes[0]))
+        if handler:
+            handler(self, nodes, arg)
+    
+    # Command handlers: called with the upper-cased header nodes and argument
+    
+    def _rst(self, nodes, arg):
+        self._reset()
+    
+    def _cls(self, nodes, arg):
+        pass  # Clear status - no action needed
+    
+    def _outp(self, nodes, arg):
+        if len(nodes) == 1 and arg in ('ON', '1'):
             self._output_on = True
-        elif "OUTPUT OFF" in cmd_upper or "OUTP OFF" in cmd_upper:
+        elif len(nodes) == 1 and arg in ('OFF', '0'):
             self._output_on = False
-        elif "VOLT" in cmd_upper:
-            # Extract voltage value
-            try:
-                parts = command.split()
-                for i, p in enumerate(parts):
-                    if 'VOLT' in p.upper():
-                        if ':' in p or '=' in p:
-                            val = p.split(':')[-1].split('=')[-1]
-                        elif i + 1 < len(parts):
-                            val = parts[i + 1]
-                        else:
-                            val = "0"
-                        self._voltage = float(val.replace('V', ''))
-                        break
-            except (ValueError, IndexError):
-                pass
-        elif "CURR" in cmd_upper or "SOUR:CURR" in cmd_upper:
-            # Extract current value
-            try:
-                parts = command.split()
-                for i, p in enumerate(parts):
-                    if 'CURR' in p.upper():
-                        if i + 1 < len(parts):
-                            self._current = float(parts[i + 1])
-                        break
-                # Also try format "sour:curr VALUE"
-                if "SOUR:CURR" in cmd_upper:
-                    val = command.split()[-1]
-                    self._current = float(val)
-            except (ValueError, IndexError):
-                pass
-        
-        # Store setting for potential queries
-        self._settings[command] = True
+    
+    def _sour(self, nodes, arg):
+        # SOURce is an optional root: 'SOUR:CURR x' is handled as 'CURR x'
+        if len(nodes) > 1:
+            self._dispatch(nodes[1:], arg)
+    
+    def _volt(self, nodes, arg):
+        if len(nodes) == 1 or _short_form(nodes[1]) == 'LEV':
+            self._voltage = _number(arg)
+    
+    def _curr(self, nodes, arg):
+        if len(nodes) == 1 or _short_form(nodes[1]) == 'LEV':
+            self._current = _number(arg)
+    
+    _HANDLERS = {
+        '*RST': _rst,
+        '*CLS': _cls,
+        'OUTP': _outp,
+        'SOUR': _sour,
+        'VOLT': _volt,
+        'CURR': _curr,
+    }
     
     def query(self, command):
         """Simulate querying the instrument - returns string"""
@@ -93,7 +129,7 @@ class MockInstrument:
             return f"Mock Instrument,Model 1000,SN12345,1.0"
         elif "READ?" in cmd_upper:
             # Return simulated current reading for Keithley
-            return str(self._current + random.gauss(0, 0.0001))
+            return str(self._current + 0.0001 * float(_RNG.standard_normal()))
         
         return "0"
     
@@ -111,18 +147,21 @@ class MockInstrument:
     
     def _reset(self):
         """Reset instrument to default state"""
-        self._settings = {}
         self._output_on = False
         self._voltage = 0.0
         self._current = 0.0
     
     def _simulate_measurement(self):
-        """Override in subclasses for specific measurement simulation"""
-        return random.gauss(0.1, 0.01)
+        """Simulate a single measurement; override in subclasses"""
+        return 0.1 + 0.01 * float(_RNG.standard_normal())
+    
+    def _simulate_measurement_batch(self, n):
+        """Simulate n measurements as an array; override in subclasses"""
+        return _RNG.normal(0.1, 0.01, n)
     
     def close(self):
         """Close the mock connection"""
-        print(f"[MOCK] Disconnected from {self.address}")
+        _log.debug("Disconnected from %s", self.address)
 
 
 class MockOscilloscope(MockInstrument):
@@ -136,55 +175,73 @@ class MockOscilloscope(MockInstrument):
         self._last_voltage = 0.0
         self._threshold_current = 0.015  # 15mA threshold current
         self._slope_efficiency = 0.8  # W/A above threshold
+        self._waveform_points = 1000
+        self.set_input_current(0.0)
         
-    def write(self, command):
-        super().write(command)
+    def _chan(self, nodes, arg):
+        # Parse channel scale commands
+        match = _CHANNEL_RE.fullmatch(nodes[0])
+        if match and len(nodes) == 2 and _short_form(nodes[1]) == 'SCAL':
+            self._channel_scales[int(match.group(1))] = _number(arg)
+    
+    def _wav(self, nodes, arg):
+        if len(nodes) == 2 and _short_form(nodes[1]) == 'POIN':
+            self._waveform_points = int(_number(arg))
+    
+    _HANDLERS = {**MockInstrument._HANDLERS, 'CHAN': _chan, 'WAV': _wav}
+    
+    def query_ascii_values(self, command):
         cmd_upper = command.upper()
         
-        # Parse channel scale commands
-        if ":CHANNEL" in cmd_upper and ":SCALE" in cmd_upper:
-            try:
-                # Extract channel number and scale value
-                import re
-                match = re.search(r':CHANNEL(\d+):SCALE\s+([\d.]+)', command, re.IGNORECASE)
-                if match:
-                    ch = int(match.group(1))
-                    scale = float(match.group(2))
-                    self._channel_scales[ch] = scale
-            except (ValueError, AttributeError):
-                pass
+        if "WAV" in cmd_upper and "DATA?" in cmd_upper:
+            # Waveform readout: one block of samples per query
+            return self._simulate_measurement_batch(self._waveform_points).tolist()
+        
+        return super().query_ascii_values(command)
     
     def set_input_current(self, current):
         """Set the simulated input current (called by mock pulser/keithley)"""
         self._last_current = current
+        # Every reading until the next current change shares this point
+        self._liv = self._liv_curve(current)
     
     def set_input_voltage(self, voltage):
         """Set the simulated input voltage"""
         self._last_voltage = voltage
         
-    def _simulate_measurement(self):
-        """Simulate realistic laser diode measurement"""
+    def _liv_curve(self, current):
+        """Noise-free light output (W) and its noise sigma at the given current"""
         # Simulate a laser diode L-I characteristic
-        # Below threshold: minimal light output
-        # Above threshold: linear increase with slope efficiency
-        
-        current = self._last_current
-        
         if current < self._threshold_current:
-            # Below threshold - just spontaneous emission noise
-            light = current * 0.01 + random.gauss(0, 0.0005)
-        else:
-            # Above threshold - lasing
-            light = (current - self._threshold_current) * self._slope_efficiency
-            light += random.gauss(0, light * 0.02)  # 2% noise
+            # Below threshold: minimal light output, just spontaneous emission noise
+            return current * 0.01, 0.0005
+        # Above threshold: linear increase with slope efficiency, 2% noise
+        light = (current - self._threshold_current) * self._slope_efficiency
+        return light, light * 0.02
+    
+    def _detector_output(self, light, sigma, size):
+        """Add noise to the light and convert to photodetector voltage"""
+        light = light + _RNG.normal(0, sigma, size)
         
         # Convert to voltage (assuming photodetector responsivity)
-        voltage_out = abs(light) * 0.5  # 0.5 V/W responsivity
+        voltage_out = np.abs(light) * 0.5  # 0.5 V/W responsivity
         
         # Add realistic noise floor
-        voltage_out = max(voltage_out, random.gauss(0.0001, 0.00005))
-        
-        return voltage_out
+        return np.maximum(voltage_out, _RNG.normal(0.0001, 0.00005, size))
+    
+    def _simulate_measurement(self):
+        """Simulate a single realistic laser diode measurement at the present current"""
+        # Scalar twin of _detector_output: one reading per query is the common
+        # case, and plain floats are much cheaper than a 1-element array
+        light, sigma = self._liv
+        light += sigma * float(_RNG.standard_normal())
+        voltage_out = abs(light) * 0.5  # 0.5 V/W responsivity
+        return max(voltage_out, 0.0001 + 0.00005 * float(_RNG.standard_normal()))
+    
+    def _simulate_measurement_batch(self, n):
+        """Simulate n realistic laser diode measurements at the present current"""
+        light, sigma = self._liv
+        return self._detector_output(light, sigma, n)
 
 
 class MockPulser(MockInstrument):
@@ -196,34 +253,29 @@ class MockPulser(MockInstrument):
         self._frequency = 1.0  # kHz
         self._oscilloscope = oscilloscope
         
-    def write(self, command):
-        super().write(command)
-        cmd_upper = command.upper()
-        
+    def _puls(self, nodes, arg):
         # Parse pulse parameters
-        if "PULSE:WIDTH" in cmd_upper or "PULS:WIDT" in cmd_upper:
-            try:
-                val = command.split()[-1].replace('us', '').replace('US', '')
-                self._pulse_width = float(val)
-            except ValueError:
-                pass
-        elif "FREQ" in cmd_upper:
-            try:
-                val = command.split()[-1].replace('kHz', '').replace('KHZ', '')
-                self._frequency = float(val)
-            except ValueError:
-                pass
-        elif "VOLT" in cmd_upper:
-            # When voltage is set, update the connected oscilloscope
-            if self._oscilloscope:
-                # Simulate current based on voltage (rough laser diode model)
-                # V = I*R + Vd, assume R=5 ohms, Vd=1.5V
-                if self._voltage > 1.5:
-                    current = (self._voltage - 1.5) / 50.0  # 50 ohm load
-                else:
-                    current = 0
-                self._oscilloscope.set_input_current(current)
-                self._oscilloscope.set_input_voltage(self._voltage)
+        if len(nodes) == 2 and _short_form(nodes[1]) == 'WIDT':
+            self._pulse_width = _number(arg)
+    
+    def _freq(self, nodes, arg):
+        self._frequency = _number(arg)
+    
+    def _volt(self, nodes, arg):
+        super()._volt(nodes, arg)
+        # When voltage is set, update the connected oscilloscope
+        if self._oscilloscope:
+            # Simulate current based on voltage (rough laser diode model)
+            # V = I*R + Vd, assume R=5 ohms, Vd=1.5V
+            if self._voltage > 1.5:
+                current = (self._voltage - 1.5) / 50.0  # 50 ohm load
+            else:
+                current = 0
+            self._oscilloscope.set_input_current(current)
+            self._oscilloscope.set_input_voltage(self._voltage)
+    
+    _HANDLERS = {**MockInstrument._HANDLERS,
+                 'PULS': _puls, 'FREQ': _freq, 'VOLT': _volt}
     
     def set_oscilloscope(self, scope):
         """Link this pulser to an oscilloscope for coordinated simulation"""
@@ -239,20 +291,18 @@ class MockKeithley(MockInstrument):
         self._compliance = 10.0  # V
         self._source_mode = "CURR"
         
-    def write(self, command):
-        super().write(command)
-        cmd_upper = command.upper()
-        
+    def _curr(self, nodes, arg):
+        super()._curr(nodes, arg)
         # Update oscilloscope when current is set
-        if "SOUR:CURR" in cmd_upper or (self._source_mode == "CURR" and "CURR" in cmd_upper):
-            if self._oscilloscope and self._output_on:
-                self._oscilloscope.set_input_current(self._current)
-        
-        if "SOUR:FUNC" in cmd_upper:
-            if "CURR" in cmd_upper:
-                self._source_mode = "CURR"
-            elif "VOLT" in cmd_upper:
-                self._source_mode = "VOLT"
+        if self._oscilloscope and self._output_on:
+            self._oscilloscope.set_input_current(self._current)
+    
+    def _func(self, nodes, arg):
+        mode = arg.strip('\'"')[:4]
+        if mode in ("CURR", "VOLT"):
+            self._source_mode = mode
+    
+    _HANDLERS = {**MockInstrument._HANDLERS, 'CURR': _curr, 'FUNC': _func}
     
     def query(self, command):
         cmd_upper = command.upper()
@@ -261,7 +311,8 @@ class MockKeithley(MockInstrument):
             # Return the set current with small measurement noise
             if self._oscilloscope:
                 self._oscilloscope.set_input_current(self._current)
-            return str(self._current + random.gauss(0, abs(self._current) * 0.001 + 0.00001))
+            sigma = abs(self._current) * 0.001 + 0.00001
+            return str(self._current + sigma * float(_RNG.standard_normal()))
         
         return super().query(command)
     
@@ -279,24 +330,14 @@ class MockCurrentPulser(MockInstrument):
         self._frequency = 1.0  # kHz  
         self._oscilloscope = oscilloscope
         
-    def write(self, command):
-        super().write(command)
-        cmd_upper = command.upper()
-        
-        # Parse current setting
-        if "CURR" in cmd_upper:
-            try:
-                parts = command.split()
-                for i, p in enumerate(parts):
-                    if 'CURR' in p.upper() and i + 1 < len(parts):
-                        self._current = float(parts[i + 1])
-                        break
-            except (ValueError, IndexError):
-                pass
-            
-            # Update oscilloscope
-            if self._oscilloscope and self._output_on:
-                self._oscilloscope.set_input_current(self._current)
+    def _curr(self, nodes, arg):
+        super()._curr(nodes, arg)
+        # Update oscilloscope
+        if self._oscilloscope and self._output_on:
+            self._oscilloscope.set_input_current(self._current)
+    
+    # ':LDI <amps>' is the current-pulser form of CURR
+    _HANDLERS = {**MockInstrument._HANDLERS, 'CURR': _curr, 'LDI': _curr}
     
     def set_oscilloscope(self, scope):
         """Link this pulser to an oscilloscope for coordinated simulation"""
@@ -309,8 +350,7 @@ class MockResourceManager:
     def __init__(self, *args, **kwargs):
         self._instruments = {}
         self._oscilloscope = None  # Shared oscilloscope for coordination
-        print("[MOCK] Using simulated VISA Resource Manager")
-        print("[MOCK] No real instruments will be accessed")
+        _log.debug("Using simulated VISA Resource Manager; no real instruments will be accessed")
     
     def list_resources(self):
         """Return a list of fake available resources"""
@@ -378,12 +418,9 @@ def get_resource_manager():
         return pyvisa.ResourceManager()
 
 
-# Print status on import
+# Report status on import (a warning, so it shows without any logging setup)
 if USE_MOCK_INSTRUMENTS:
-    print("=" * 60)
-    print("  MOCK INSTRUMENT MODE ENABLED")
-    print("  All instrument communications will be simulated")
-    print("  Set MOCK_INSTRUMENTS=0 to use real instruments")
-    print("=" * 60)
+    _log.warning("MOCK INSTRUMENT MODE ENABLED: all instrument communications "
+                 "will be simulated. Set MOCK_INSTRUMENTS=0 to use real instruments")
 
 